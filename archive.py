@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from http_client import fetch_json, close_session
+from leagues import LEAGUES, espn_url
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+ARCHIVE_PATH = os.path.join('data', 'archive.sqlite3')
+BACKFILL_CONCURRENCY = 8  # Parallel ESPN requests during a backfill
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scoreboards (
+    league TEXT NOT NULL,
+    date TEXT NOT NULL,
+    events TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    PRIMARY KEY (league, date)
+)
+"""
+
+# -----------------------------------------------------------------------
+# ------------------------------ Database -------------------------------
+# -----------------------------------------------------------------------
+
+def _connect():
+    os.makedirs(os.path.dirname(ARCHIVE_PATH), exist_ok=True)
+    conn = sqlite3.connect(ARCHIVE_PATH)
+    conn.execute(SCHEMA)
+    return conn
+
+
+def _load(key, day):
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT events FROM scoreboards WHERE league = ? AND date = ?", (key, day)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _store(key, day, events):
+    with closing(_connect()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO scoreboards (league, date, events, archived_at) VALUES (?, ?, ?, ?)",
+            (key, day, json.dumps(events), datetime.now().isoformat(timespec='seconds'))
+        )
+
+
+def _archived_dates(key):
+    with closing(_connect()) as conn:
+        rows = conn.execute("SELECT date FROM scoreboards WHERE league = ?", (key,)).fetchall()
+    return {row[0] for row in rows}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def is_final(day, events):
+    """A date is final once it is in the past and none of its games can still change."""
+    if day >= date.today().isoformat():
+        return False
+    return all(game.get('status', {}).get('type', {}).get('completed', False)
+               or game.get('status', {}).get('type', {}).get('state') == 'post'
+               for game in events)
+
+
+async def get_scoreboard(key, day):
+    """Return the scoreboard events for a league on a YYYY-MM-DD date.
+
+    Finished dates are served from the on-disk archive; anything else goes to
+    ESPN, and is archived once all of its games are final.
+    """
+    events = await asyncio.to_thread(_load, key, day)
+    if events is not None:
+        return events
+
+    response = await fetch_json(espn_url(key, 'scoreboard'), params={'dates': day.replace('-', '')})
+    events = response.get('events', [])
+    if is_final(day, events):
+        await asyncio.to_thread(_store, key, day, events)
+    return events
+
+
+def season_dates(key, season):
+    """Every date of a league's season, e.g. season 2023 for the 2023-24 NBA season."""
+    (start_month, start_day), (end_month, end_day) = LEAGUES[key]['season']
+    start = date(season, start_month, start_day)
+    end = date(season + (1 if (end_month, end_day) < (start_month, start_day) else 0), end_month, end_day)
+    end = min(end, date.today() - timedelta(days=1))
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+async def backfill(key, season, concurrency=BACKFILL_CONCURRENCY):
+    """Archive every finished date of a season, fetching missing dates concurrently.
+
+    Returns the number of dates fetched from ESPN.
+    """
+    archived = await asyncio.to_thread(_archived_dates, key)
+    missing = [day for day in season_dates(key, season) if day not in archived]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(day):
+        async with semaphore:
+            try:
+                await get_scoreboard(key, day)
+            except Exception as e:
+                print(f"Error backfilling {key} {day}: {e}")
+
+    await asyncio.gather(*(fetch(day) for day in missing))
+    return len(missing)
+
+
+async def _main(key, season):
+    try:
+        fetched = await backfill(key, season)
+        print(f"Backfilled {fetched} {key.upper()} dates for the {season} season.")
+    finally:
+        await close_session()
+
+
+if __name__ == '__main__':
+    # Usage: python archive.py <league> <season>, e.g. python archive.py nba 2023
+    if len(sys.argv) != 3 or sys.argv[1].lower() not in LEAGUES:
+        print(f"Usage: python archive.py <{'|'.join(LEAGUES)}> <season start year>")
+        sys.exit(1)
+    asyncio.run(_main(sys.argv[1].lower(), int(sys.argv[2])))
@@ -0,0 +1,145 @@
+import os
+import time
+import discord
+from lavalink_client import pool, LavalinkTrack, LavalinkVoice
+from opus_cache import opus_cache
+from track_cache import STREAM_MIN_LIFETIME
+from track_resolver import resolver, MAX_PLAYLIST_TRACKS
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+AUDIO_BACKEND = os.getenv('AUDIO_BACKEND', 'ffmpeg')  # 'ffmpeg' or 'lavalink'
+
+FFMPEG_OPTIONS = {
+    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
+    'options': '-vn -c:a libopus -b:a 128k -application lowdelay'
+}
+EXPIRY_MARGIN = STREAM_MIN_LIFETIME  # Re-resolve stream URLs that expire sooner than this; the track cache won't serve them either
+
+# -------------------------------------------------------------------------
+# ------------------------------ Audio Backends ---------------------------
+# -------------------------------------------------------------------------
+
+class AudioBackend:
+    """How guild players find tracks and turn them into audio.
+
+    Tracks are dicts with at least 'title'; playlist entries may hold nothing
+    more until refresh() fills them in. open() returns what the backend's
+    voice client (voice_cls) accepts in play(), so GuildPlayer drives every
+    backend the same way.
+    """
+
+    name = None
+    voice_cls = discord.VoiceClient
+
+    async def start(self, bot):
+        """Called once the bot is logged in."""
+
+    async def close(self):
+        """Called on shutdown."""
+
+    async def resolve(self, query, guild_id, user_id=None):
+        """Look a search or URL up and return a track."""
+        raise NotImplementedError
+
+    async def resolve_playlist(self, url, guild_id, user_id=None):
+        """(playlist title, tracks) for a playlist link, or None if it's a single track."""
+        return None
+
+    async def refresh(self, track, guild_id, force=False):
+        """Make sure a queued track can still be opened, looking it up again if needed."""
+
+    async def open(self, track, guild_id):
+        """Return an audio source for the track, ready for voice_client.play()."""
+        raise NotImplementedError
+
+
+class FFmpegBackend(AudioBackend):
+    """yt_dlp lookups in the track resolver and one local FFmpeg process per playing guild.
+
+    Frequently played tracks are kept encoded in the Opus cache and played
+    from disk, with no lookup and no FFmpeg process.
+    """
+
+    name = 'ffmpeg'
+
+    async def close(self):
+        await opus_cache.close()
+        resolver.shutdown()
+
+    async def resolve(self, query, guild_id, user_id=None):
+        return await resolver.resolve(query, guild_id, user_id)
+
+    async def resolve_playlist(self, url, guild_id, user_id=None):
+        playlist = await resolver.resolve_playlist(url, guild_id, user_id)
+        return playlist and (playlist['title'], playlist['tracks'])
+
+    async def refresh(self, track, guild_id, force=False):
+        """Look a track up if it hasn't been yet (a playlist entry), or again if its
+        stream URL expires soon (or `force`). Cached tracks need neither."""
+        if not force and track in opus_cache:
+            return
+        if force or 'url' not in track or track.get('expires', float('inf')) - time.time() < EXPIRY_MARGIN:
+            fresh = await resolver.resolve(track.get('webpage_url') or track['title'], guild_id, use_cache=not force)
+            track.update(url=fresh['url'], expires=fresh['expires'], id=fresh.get('id'),
+                         duration=fresh.get('duration'), is_live=fresh.get('is_live', False))
+
+    async def open(self, track, guild_id):
+        """Play the cached file if there is one, else open the stream with FFmpeg. If that
+        fails, the track is looked up again once, in case its stream URL had gone stale."""
+        source = opus_cache.open(track)
+        if source is not None:
+            return source
+        try:
+            await self.refresh(track, guild_id)
+            source = await discord.FFmpegOpusAudio.from_probe(track['url'], **FFMPEG_OPTIONS)
+        except Exception:
+            await self.refresh(track, guild_id, force=True)
+            source = await discord.FFmpegOpusAudio.from_probe(track['url'], **FFMPEG_OPTIONS)
+        opus_cache.played(track)
+        return source
+
+
+class LavalinkBackend(AudioBackend):
+    """Search, transcoding and buffering on Lavalink nodes; the bot only sends commands."""
+
+    name = 'lavalink'
+    voice_cls = LavalinkVoice
+
+    async def start(self, bot):
+        await pool.connect(bot.user.id)
+
+    async def close(self):
+        await pool.close()
+
+    async def resolve(self, query, guild_id, user_id=None):
+        return _lavalink_track(await pool.search(query))
+
+    async def resolve_playlist(self, url, guild_id, user_id=None):
+        # Lavalink loads the playlist itself and only hands back encoded tracks
+        playlist = await pool.load_playlist(url)
+        if playlist is None:
+            return None
+        title, tracks = playlist
+        return title, [_lavalink_track(data) for data in tracks[:MAX_PLAYLIST_TRACKS]]
+
+    async def open(self, track, guild_id):
+        return LavalinkTrack(track['encoded'], track['title'])
+
+
+def _lavalink_track(data):
+    info = data['info']
+    return {
+        'title': info['title'],
+        'url': info.get('uri'),
+        'webpage_url': info.get('uri'),
+        'encoded': data['encoded'],  # Encoded tracks don't expire, so refresh() has nothing to do
+    }
+
+
+BACKENDS = {backend.name: backend for backend in (FFmpegBackend, LavalinkBackend)}
+
+# The backend every guild player uses, picked with AUDIO_BACKEND
+backend = BACKENDS[AUDIO_BACKEND]()
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from discord import app_commands
+from leagues import LEAGUES
+from live_scores import get_events
+from team_index import cached_team_index
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# Every handler here answers from memory only: Discord drops autocomplete
+# responses after 3 seconds, so none of them may touch the network.
+MAX_CHOICES = 25    # Discord's limit per autocomplete response
+PAST_DAYS = 7
+FUTURE_DAYS = 3
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _selected_leagues(interaction):
+    """League keys to suggest from, narrowed by the 'sport' option if it is filled in."""
+    sport = getattr(interaction.namespace, 'sport', None)
+    if sport and sport.lower() in LEAGUES:
+        return [sport.lower()]
+    return list(LEAGUES)
+
+
+async def sport_autocomplete(interaction, current):
+    current = current.lower()
+    return [
+        app_commands.Choice(name=league['name'], value=key)
+        for key, league in LEAGUES.items()
+        if current in key or current in league['name'].lower()
+    ][:MAX_CHOICES]
+
+
+async def team_autocomplete(interaction, current):
+    return _team_choices(_selected_leagues(interaction), current)
+
+
+async def nba_team_autocomplete(interaction, current):
+    """Team suggestions for NBA-only commands, which have no 'sport' option."""
+    return _team_choices(['nba'], current)
+
+
+def _team_choices(keys, current):
+    choices = []
+    for key in keys:
+        index = cached_team_index(key)
+        if index is None:
+            continue  # Not built yet; it is warmed at startup
+        if current:
+            teams = [team for team, _ in index.search(current, limit=MAX_CHOICES)]
+        else:
+            teams = sorted(index.teams.values(), key=lambda team: team['displayName'])
+        choices.extend(app_commands.Choice(name=team['displayName'], value=team['displayName']) for team in teams)
+    return choices[:MAX_CHOICES]
+
+
+async def matchup_autocomplete(interaction, current):
+    current = current.lower()
+    choices = []
+    for key in _selected_leagues(interaction):
+        for game in get_events(key) or []:
+            competitors = game['competitions'][0]['competitors']
+            matchup = f"{competitors[0]['team']['displayName']} vs {competitors[1]['team']['displayName']}"
+            if current in matchup.lower():
+                choices.append(app_commands.Choice(name=matchup, value=matchup))
+    return choices[:MAX_CHOICES]
+
+
+async def date_autocomplete(interaction, current):
+    today = date.today()
+    labels = {today: "Today", today - timedelta(days=1): "Yesterday", today + timedelta(days=1): "Tomorrow"}
+    days = [today + timedelta(days=offset) for offset in range(FUTURE_DAYS, -PAST_DAYS - 1, -1)]
+
+    choices = []
+    for day in sorted(days, key=lambda d: abs((d - today).days)):
+        value = day.isoformat()
+        if value.startswith(current.strip()):
+            name = f"{value} ({labels[day]})" if day in labels else value
+            choices.append(app_commands.Choice(name=name, value=value))
+    return choices[:MAX_CHOICES]
@@ -0,0 +1,139 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss
+from game_store import game_store
+from ml_service import MAX_WORKERS
+from predictions import FEATURES, TARGET, MIN_TRAINING_ROWS, prepare_features, train_model
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+STEP_DAYS = 14          # Length of each walk-forward fold; the model is retrained before each one
+MIN_TRAINING_GAMES = 200
+SEED = 42               # Fold i trains with SEED + i, so a run is reproducible whatever the worker count
+
+# Columns each fold needs besides the features
+RESULT_COLUMNS = ['GameID', 'DateTime', 'HomeTeam', 'AwayTeam', TARGET, 'HomeMoneyLine', 'AwayMoneyLine']
+
+# ---------------------------------------------------------------------------
+# ------------------------------ Worker Process -----------------------------
+# ---------------------------------------------------------------------------
+
+# Feature frame for the whole store, sent once to each worker
+_games = None
+
+
+def _init_worker(games):
+    global _games
+    _games = games
+
+
+def _fold_job(fold, start, end, seed, min_training_games):
+    """Train on every game before `start` and predict the games in [start, end)."""
+    train = _games[_games['DateTime'] < start]
+    test = _games[(_games['DateTime'] >= start) & (_games['DateTime'] < end)]
+    if test.empty or len(train) < max(min_training_games, MIN_TRAINING_ROWS):
+        return None
+
+    model, _ = train_model(train, seed=seed)
+    result = test[RESULT_COLUMNS].copy()
+    result['HomeWinProb'] = model.predict_proba(test[FEATURES])[:, 1]
+    result['Fold'] = fold
+    return result
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def payout(moneyline):
+    """Profit per unit staked on a winning bet at American odds."""
+    moneyline = np.asarray(moneyline, dtype=float)
+    return np.where(moneyline > 0, moneyline / 100, 100 / np.abs(moneyline))
+
+
+def evaluate(results):
+    """Accuracy, log-loss and flat-stake moneyline ROI for a frame of backtest predictions.
+
+    Every pick is a one-unit bet on the predicted winner at the closing line
+    (games without a line aren't bet). The value ROI only counts bets where
+    the model's probability beats the line's implied probability.
+    """
+    outcome = results[TARGET].to_numpy()
+    probability = results['HomeWinProb'].to_numpy()
+    pick_home = probability >= 0.5
+
+    odds = np.where(pick_home, results['HomeMoneyLine'], results['AwayMoneyLine']).astype(float)
+    has_line = ~np.isnan(odds)
+    won = pick_home == (outcome == 1)
+    profit = np.where(won, payout(np.where(has_line, odds, 100)), -1.0)
+
+    pick_probability = np.where(pick_home, probability, 1 - probability)
+    implied = 1 / (1 + payout(np.where(has_line, odds, 100)))
+    value = has_line & (pick_probability > implied)
+
+    return {
+        'games': len(results),
+        'folds': int(results['Fold'].nunique()),
+        'accuracy': float(accuracy_score(outcome, pick_home.astype(int))),
+        'log_loss': float(log_loss(outcome, probability, labels=[0, 1])),
+        'bets': int(has_line.sum()),
+        'roi': float(profit[has_line].mean()) if has_line.any() else None,
+        'value_bets': int(value.sum()),
+        'value_roi': float(profit[value].mean()) if value.any() else None,
+    }
+
+
+def run_backtest(start, end, step_days=STEP_DAYS, seed=SEED, workers=MAX_WORKERS,
+                 min_training_games=MIN_TRAINING_GAMES, store=None):
+    """Walk forward from `start` to `end` (inclusive), retraining every `step_days`.
+
+    Features are built once for the whole store (they only look at earlier
+    games, so nothing leaks), then the folds run in parallel in a process pool.
+    Returns (predictions frame, metrics).
+    """
+    store = store or game_store
+    games = prepare_features(store.frame().copy(), teams=store.teams())
+    games = games[FEATURES + [column for column in RESULT_COLUMNS if column not in FEATURES]]
+
+    start, end = pd.Timestamp(start), pd.Timestamp(end) + timedelta(days=1)
+    starts = pd.date_range(start, end, freq=f'{step_days}D', inclusive='left')
+    folds = [(i, s, min(s + timedelta(days=step_days), end), seed + i, min_training_games) for i, s in enumerate(starts)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(games,)) as pool:
+        results = list(pool.map(_fold_job, *zip(*folds))) if folds else []
+
+    results = [result for result in results if result is not None]
+    if not results:
+        raise ValueError(f"No games between {start.date()} and {end.date()} with enough history to train on.")
+
+    predictions = pd.concat(results, ignore_index=True)
+    return predictions, evaluate(predictions)
+
+
+def _format_metrics(metrics):
+    def pct(value):
+        return 'n/a' if value is None else f"{value:+.1%}"
+
+    return "\n".join([
+        f"Games:     {metrics['games']} over {metrics['folds']} folds",
+        f"Accuracy:  {metrics['accuracy']:.1%}",
+        f"Log-loss:  {metrics['log_loss']:.4f}",
+        f"ROI:       {pct(metrics['roi'])} on {metrics['bets']} moneyline bets",
+        f"Value ROI: {pct(metrics['value_roi'])} on {metrics['value_bets']} bets with an edge",
+    ])
+
+
+if __name__ == '__main__':
+    # Usage: python backtest.py <start> <end> [step days] [seed], e.g. python backtest.py 2023-11-01 2024-04-14
+    if len(sys.argv) not in (3, 4, 5):
+        print("Usage: python backtest.py <start YYYY-MM-DD> <end YYYY-MM-DD> [step days] [seed]")
+        sys.exit(1)
+
+    step = int(sys.argv[3]) if len(sys.argv) > 3 else STEP_DAYS
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else SEED
+    _, metrics = run_backtest(sys.argv[1], sys.argv[2], step_days=step, seed=seed)
+    print(_format_metrics(metrics))
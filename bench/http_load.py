@@ -0,0 +1,111 @@
+"""Event-loop lag and per-command p99 with blocking fetches versus the shared session.
+
+Usage: python bench/http_load.py [concurrent commands] [upstream seconds]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import fetch_json, close_session  # noqa: E402
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def start_upstream(delay):
+    """Serve JSON after `delay` seconds from a thread with its own loop, standing in for ESPN.
+
+    It can't share the benchmark's loop: the blocking fetches would stall it too.
+    Returns (base URL, stop function).
+    """
+    ready = threading.Event()
+    state = {}
+
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return web.json_response({'path': request.path})
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get('/{name}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        state['port'] = runner.addresses[0][1]
+        state['stop'] = asyncio.Event()
+        ready.set()
+        await state['stop'].wait()
+        await runner.cleanup()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(state['stop'].set)
+        thread.join()
+        loop.close()
+
+    return f"http://127.0.0.1:{state['port']}", stop
+
+
+def blocking_fetch(url):
+    """How fetches worked before: a blocking GET inside the coroutine, new connection each time."""
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+async def run_commands(fetch, base_url, commands):
+    lags, latencies = [], []
+
+    async def ticker():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+
+    async def command(i):
+        await fetch(f'{base_url}/item{i}')  # Distinct URLs, so nothing is coalesced
+        latencies.append(time.perf_counter() - started)  # From when every command was issued
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(command(i) for i in range(commands)))
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.02)  # Let the ticker see a loop that was blocked until now
+    tick.cancel()
+    return elapsed, lags, sorted(latencies)
+
+
+async def main(commands=50, upstream_seconds=0.2):
+    """Run `commands` concurrent commands, each fetching one slow upstream URL, first with
+    blocking fetches and then with the shared session."""
+    base_url, stop = start_upstream(upstream_seconds)
+
+    async def blocking(url):
+        return blocking_fetch(url)
+
+    try:
+        for name, fetch in (('before (blocking GET)', blocking), ('after (shared session)', fetch_json)):
+            elapsed, lags, latencies = await run_commands(fetch, base_url, commands)
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{name}: {commands} commands in {elapsed:.2f}s, "
+                  f"loop lag max {max(lags) * 1000:.0f} ms, command p99 {p99 * 1000:.0f} ms")
+    finally:
+        await close_session()
+        stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.2,
+    ))
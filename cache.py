@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import OrderedDict
+from http_client import fetch_json, request_key
+from leagues import espn_url
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Per-endpoint freshness, in seconds
+# 'ttl' is how long an entry is fresh. After that it is still served for up to
+# 'stale_ttl' more seconds while a background refresh replaces it.
+ENDPOINT_TTLS = {
+    'teams': {'ttl': 24 * 60 * 60, 'stale_ttl': 7 * 24 * 60 * 60},  # Changes about once a season
+    'scoreboard': {'ttl': 15, 'stale_ttl': 60},                      # Live scores
+    'news': {'ttl': 5 * 60, 'stale_ttl': 30 * 60},
+}
+MAX_ENTRIES = 256
+
+# -------------------------------------------------------------------------
+# ------------------------------ Response Cache ---------------------------
+# -------------------------------------------------------------------------
+
+class ResponseCache:
+    """LRU cache of decoded JSON responses with TTL and stale-while-revalidate."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (data, fetched_at)
+        self._refreshing = {}          # key -> background refresh task
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(self, url, params=None, ttl=60, stale_ttl=0):
+        """Return the cached response for a URL, fetching or refreshing as needed."""
+        key = request_key(url, params)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            data, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return data
+            if age < ttl + stale_ttl:
+                # Serve the stale copy now and refresh it in the background.
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._refresh_in_background(key, url, params)
+                return data
+
+        self.misses += 1
+        return await self._fetch(key, url, params)
+
+    async def _fetch(self, key, url, params):
+        data = await fetch_json(url, params=params)
+        self._entries[key] = (data, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Evict the least recently used entry
+        return data
+
+    def _refresh_in_background(self, key, url, params):
+        if key in self._refreshing:
+            return  # A refresh for this entry is already running
+
+        async def refresh():
+            try:
+                await self._fetch(key, url, params)
+            except Exception as e:
+                print(f"Error refreshing cached {url}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, url, params=None):
+        self._entries.pop(request_key(url, params), None)
+
+    def stats(self):
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+
+# Shared cache for the ESPN site API
+response_cache = ResponseCache()
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+async def fetch_espn(key, resource, params=None):
+    """Fetch an ESPN resource for a league through the cache using its endpoint TTLs."""
+    ttls = ENDPOINT_TTLS.get(resource, {'ttl': 60, 'stale_ttl': 0})
+    return await response_cache.get(espn_url(key, resource), params=params, **ttls)
+
+
+async def fetch_teams(key):
+    """Return the list of team entries for a league."""
+    response = await fetch_espn(key, 'teams')
+    return response['sports'][0]['leagues'][0]['teams']
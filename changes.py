@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+FINGERPRINT_BYTES = 8  # 64-bit digests are plenty for a few hundred entities per feed
+
+# -------------------------------------------------------------------------
+# ------------------------------ Change Tracker ---------------------------
+# -------------------------------------------------------------------------
+
+def fingerprint(payload):
+    """Compact, order-independent digest of a JSON-like value."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=FINGERPRINT_BYTES).digest()
+
+
+class ChangeTracker:
+    """Remembers one fingerprint per entity and reports which entities changed."""
+
+    def __init__(self):
+        self._fingerprints = {}  # entity id -> fingerprint
+
+    def update(self, entities):
+        """Record the current entities and return the ids that are new or modified.
+
+        `entities` maps an entity id to the part of the payload that matters for
+        it. Entities that are no longer present are forgotten.
+        """
+        current = {entity_id: fingerprint(payload) for entity_id, payload in entities.items()}
+        changed = {
+            entity_id for entity_id, digest in current.items()
+            if self._fingerprints.get(entity_id) != digest
+        }
+        self._fingerprints = current
+        return changed
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def news_entities(articles):
+    """One entity per ESPN article id."""
+    return {
+        article.get('id', article.get('headline')): [
+            article.get('headline'), article.get('description'), article.get('lastModified')
+        ]
+        for article in articles
+    }
+
+
+def score_entities(games):
+    """One entity per ESPN game id, covering only the scores and game status."""
+    return {
+        game.get('id'): [
+            [c.get('score') for c in game['competitions'][0]['competitors']],
+            game.get('status', {}).get('type', {}).get('name'),
+            game.get('status', {}).get('period'),
+        ]
+        for game in games
+    }
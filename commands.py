@@ -1,17 +1,23 @@
 import discord
 from discord.ext import commands
 from discord import app_commands, Color, Embed, Interaction, TextChannel
-import yt_dlp
 import asyncio
-import requests
 import datetime
-from nba import fetch_latest_nba_odds, fetch_latest_nba_news
-from nba import send_nba_scores_to_channel as nba_scores
-from nfl import fetch_latest_nfl_odds, fetch_latest_nfl_news
-from nfl import send_nfl_scores_to_channel as nfl_scores
+from feeds import fetch_latest_odds, fetch_latest_news, fetch_latest_scores, as_embed
+from leagues import LEAGUES, get_league, league_names
 import openai
 from security import OPENAI_API_KEY, DISCORD_CHANNEL_ID_PICKS
-from predictions import generate_predictions_for_today
+from ml_service import MLServiceBusy
+from prediction_cache import get_slate, grade, pick_record
+from cache import fetch_espn, fetch_teams
+from live_scores import get_events
+from archive import get_scoreboard, backfill as backfill_season
+from team_index import get_team_index
+from autocomplete import sport_autocomplete, team_autocomplete, nba_team_autocomplete, matchup_autocomplete, date_autocomplete
+from ratings import get_ratings, ESPN_ABBREVIATIONS
+from track_resolver import resolver, is_playlist_url, ResolverBusy, ResolveCancelled
+from music_player import get_player, remove_player
+from audio_backends import backend
 
 
 # --------------------------------------------------------------------------
@@ -22,24 +28,6 @@ from predictions import generate_predictions_for_today
 openai.api_key = OPENAI_API_KEY
 PICKS_CHANNEL_NAME = "picks"
 
-# --------------- Define the ESPN URLs for NBA and NFL searching
-espn_urls = {
-    'nba': 'http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard',
-    'nba_teams': 'http://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams',
-    'nfl': 'http://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard',
-    'nfl_teams': 'http://site.api.espn.com/apis/site/v2/sports/football/nfl/teams'
-}
-
-# --------------- Settings for the music bot
-FFMPEG_OPTIONS = {
-    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-    'options': '-vn -c:a libopus -b:a 128k -application lowdelay'
-}
-YDL_OPTIONS = {'format': 'bestaudio/best', 'noplaylist': 'True', 'default_search': 'ytsearch'}
-
-# --------------- Queue for the music bot 
-queue = [] 
-
 # ----- Cog for role button
 class RoleButton(discord.ui.View):
     def __init__(self, role_id):
@@ -134,56 +122,67 @@ class SportsBot(commands.Cog):
         if not voice_channel:
             return await interaction.response.send_message("You are not in a voice channel.")
 
-        if not interaction.guild.voice_client:
-            await voice_channel.connect()
-
-        async with interaction.channel.typing():
-            with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl:
-                info = ydl.extract_info(f"ytsearch:{search}", download=False)['entries'][0]
-                url, title = info['url'], info['title']
-                queue.append((url, title))
-                embed = discord.Embed(
-                    title="Song Added to Queue",
-                    description=f"**{title}** added to the queue.",
-                    color=discord.Color.red()
-                )
-                embed.set_footer(text="Strategic Investments & Sports Analysis")
-                await interaction.response.send_message(embed=embed)
+        await interaction.response.defer()  # Looking the song up can take a few seconds
 
-            if not interaction.guild.voice_client.is_playing():
-                await self.play_next(interaction)
+        # Look the song up through the audio backend, off the event loop. Playlists are
+        # only listed here; each entry is looked up just before it plays.
+        playlist = None
+        try:
+            if is_playlist_url(search):
+                playlist = await backend.resolve_playlist(search, interaction.guild.id, interaction.user.id)
+            if playlist is None:
+                track = await backend.resolve(search, interaction.guild.id, interaction.user.id)
+        except ResolverBusy:
+            return await interaction.followup.send("Too many songs are being looked up. Please try again shortly.", ephemeral=True)
+        except asyncio.TimeoutError:
+            return await interaction.followup.send(f"Looking up **{search}** took too long.", ephemeral=True)
+        except ResolveCancelled:
+            return await interaction.followup.send("You left the voice channel, so the song wasn't queued.", ephemeral=True)
+        except Exception as e:
+            return await interaction.followup.send(f"Could not find **{search}**: {e}", ephemeral=True)
 
-    async def play_next(self, interaction: discord.Interaction):
-        if queue:
-            url, title = queue.pop(0)
-            try:
-                source = await discord.FFmpegOpusAudio.from_probe(url, **FFMPEG_OPTIONS)
-                interaction.guild.voice_client.play(
-                    source, 
-                    after=lambda e: asyncio.run_coroutine_threadsafe(self.play_next(interaction), self.bot.loop)
-                )
-                embed = discord.Embed(
-                    title="Now Playing",
-                    description=f"**{title}**",
-                    color=discord.Color.red()
-                )
-                embed.set_footer(text="Strategic Investments & Sports Analysis")
-                await interaction.channel.send(embed=embed)
-            except Exception as e:
-                await interaction.channel.send(f"Error playing {title}: {e}")
-                await self.play_next(interaction)
+        if playlist is not None and not playlist[1]:
+            return await interaction.followup.send(f"**{playlist[0]}** has no playable tracks.", ephemeral=True)
+
+        if not interaction.guild.voice_client:
+            await voice_channel.connect(cls=backend.voice_cls)
+
+        player = get_player(interaction.guild)
+        player.text_channel = interaction.channel
+        if playlist is not None:
+            title, tracks = playlist
+            position = player.extend(tracks)
+            embed = discord.Embed(
+                title="Playlist Added to Queue",
+                description=f"**{len(tracks)}** tracks from **{title}** added to the queue from position {position}.",
+                color=discord.Color.red()
+            )
         else:
-            await interaction.channel.send("The queue is empty.")
+            position = player.add(track)
+            embed = discord.Embed(
+                title="Song Added to Queue",
+                description=f"**{track['title']}** added to the queue at position {position}.",
+                color=discord.Color.red()
+            )
+        embed.set_footer(text="Strategic Investments & Sports Analysis")
+        await interaction.followup.send(embed=embed)
+
+        if not player.is_playing() and not player.starting:
+            await player.play_next()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        """Drop a member's pending song lookups when they leave voice, and the player when the bot does."""
+        if before.channel and before.channel != after.channel:
+            resolver.cancel(member.guild.id, member.id)
+            if member.id == self.bot.user.id and after.channel is None:
+                await remove_player(member.guild.id)
 
     # --------------- Command to skip the track
     @app_commands.command(name="skip", description="Skip the currently playing track.")
     async def skip(self, interaction: discord.Interaction):
         """Skip the currently playing track."""
-        voice_client = interaction.guild.voice_client
-
-        if voice_client and voice_client.is_playing():
-            voice_client.stop()
-
+        if get_player(interaction.guild).skip():
             embed = discord.Embed(
                 title="Track Skipped",
                 description="The track has been skipped.",
@@ -197,40 +196,76 @@ class SportsBot(commands.Cog):
 
     # --------------- Command to check the queue of songs
     @app_commands.command(name="queue", description="Show the current music queue.")
-    async def show_queue(self, interaction: discord.Interaction):
-        """Show the current music queue."""
-        if not self.queue:
-            embed = discord.Embed(
-                title="Music Queue",
-                description="The queue is empty.",
-                color=discord.Color.red()
-            )
-            embed.set_footer(text="Strategic Investments & Sports Analysis")
-            return await interaction.response.send_message(embed=embed)
-
+    @app_commands.describe(page="The page of the queue to show")
+    async def show_queue(self, interaction: discord.Interaction, page: int = 1):
+        """Show one page of this server's music queue."""
+        player = get_player(interaction.guild)
         embed = discord.Embed(title="Music Queue", color=discord.Color.red())
-        for idx, (_, title) in enumerate(self.queue, start=1):
-            embed.add_field(name=f"{idx}. {title}", value='\u200b', inline=False)
+
+        if player.current:
+            embed.add_field(name="Now Playing", value=f"**{player.current['title']}**", inline=False)
+
+        if not player.queue:
+            embed.description = "The queue is empty."
+        else:
+            tracks, page, pages = player.page(page)
+            for position, track in tracks:
+                embed.add_field(name=f"{position}. {track['title']}", value='\u200b', inline=False)
+            embed.description = f"Page {page}/{pages} · {len(player.queue)} tracks queued"
 
         embed.set_footer(text="Strategic Investments & Sports Analysis")
         await interaction.response.send_message(embed=embed)
 
+    # --------------- Command to remove a song from the queue
+    @app_commands.command(name="remove", description="Remove a track from the queue.")
+    @app_commands.describe(position="The track's position in /queue")
+    async def remove(self, interaction: discord.Interaction, position: int):
+        try:
+            track = get_player(interaction.guild).remove(position)
+        except IndexError as e:
+            return await interaction.response.send_message(str(e), ephemeral=True)
+
+        embed = discord.Embed(title="Track Removed", description=f"**{track['title']}** was removed from the queue.", color=discord.Color.red())
+        embed.set_footer(text="Strategic Investments & Sports Analysis")
+        await interaction.response.send_message(embed=embed)
+
+    # --------------- Command to move a song in the queue
+    @app_commands.command(name="move", description="Move a track to another position in the queue.")
+    @app_commands.describe(position="The track's position in /queue", new_position="Where to move it")
+    async def move(self, interaction: discord.Interaction, position: int, new_position: int):
+        try:
+            track = get_player(interaction.guild).move(position, new_position)
+        except IndexError as e:
+            return await interaction.response.send_message(str(e), ephemeral=True)
+
+        embed = discord.Embed(title="Track Moved", description=f"**{track['title']}** moved to position {new_position}.", color=discord.Color.red())
+        embed.set_footer(text="Strategic Investments & Sports Analysis")
+        await interaction.response.send_message(embed=embed)
+
+    # --------------- Command to shuffle the queue
+    @app_commands.command(name="shuffle", description="Shuffle the music queue.")
+    async def shuffle(self, interaction: discord.Interaction):
+        player = get_player(interaction.guild)
+        if not player.queue:
+            return await interaction.response.send_message("The queue is empty.", ephemeral=True)
+
+        player.shuffle()
+        embed = discord.Embed(title="Queue Shuffled", description=f"Shuffled {len(player.queue)} tracks.", color=discord.Color.red())
+        embed.set_footer(text="Strategic Investments & Sports Analysis")
+        await interaction.response.send_message(embed=embed)
+
     # --------------- Command to pause the current song
-    @app_commands.command(name="queue", description="Show the current music queue.")
-    async def show_queue(self, interaction: discord.Interaction):
-        """Show the current music queue."""
-        if not self.queue:
-            embed = discord.Embed(
-                title="Music Queue",
-                description="The queue is empty.",
-                color=discord.Color.red()
-            )
-            embed.set_footer(text="Strategic Investments & Sports Analysis")
-            return await interaction.response.send_message(embed=embed)
+    @app_commands.command(name="pause", description="Pause the currently playing track.")
+    async def pause(self, interaction: discord.Interaction):
+        """Pause the currently playing track."""
+        embed = discord.Embed(color=discord.Color.red())
 
-        embed = discord.Embed(title="Music Queue", color=discord.Color.red())
-        for idx, (_, title) in enumerate(self.queue, start=1):
-            embed.add_field(name=f"{idx}. {title}", value='\u200b', inline=False)
+        if get_player(interaction.guild).pause():
+            embed.title = "Track Paused"
+            embed.description = "The current track has been paused."
+        else:
+            embed.title = "No Track Playing"
+            embed.description = "There is no track currently playing."
 
         embed.set_footer(text="Strategic Investments & Sports Analysis")
         await interaction.response.send_message(embed=embed)
@@ -241,8 +276,7 @@ class SportsBot(commands.Cog):
         """Resume the currently paused track."""
         embed = discord.Embed(color=discord.Color.red())
 
-        if interaction.guild.voice_client and interaction.guild.voice_client.is_paused():
-            interaction.guild.voice_client.resume()  # Resumes the paused track
+        if get_player(interaction.guild).resume():
             embed.title = "Track Resumed"
             embed.description = "The paused track has been resumed."
         else:
@@ -255,13 +289,12 @@ class SportsBot(commands.Cog):
     # --------------- Command to stop the current song
     @app_commands.command(name="stop", description="Stop the currently playing track.")
     async def stop(self, interaction: discord.Interaction):
-        """Stop the currently playing track."""
+        """Stop the currently playing track and clear the queue."""
         embed = discord.Embed(color=discord.Color.red())
 
-        if interaction.guild.voice_client and interaction.guild.voice_client.is_playing():
-            interaction.guild.voice_client.stop()  # Stops the current track
+        if get_player(interaction.guild).stop():
             embed.title = "Track Stopped"
-            embed.description = "The current track has been stopped."
+            embed.description = "The current track has been stopped and the queue cleared."
         else:
             embed.title = "No Track Playing"
             embed.description = "There is no track currently playing."
@@ -275,7 +308,8 @@ class SportsBot(commands.Cog):
         embed = discord.Embed(color=discord.Color.red())
 
         if interaction.guild.voice_client:
-            await interaction.guild.voice_client.disconnect()
+            get_player(interaction.guild)  # Make sure the player holds the live voice client
+            await remove_player(interaction.guild.id)
             embed.title = "Disconnected"
             embed.description = "The bot has been disconnected from the voice channel."
         else:
@@ -297,17 +331,22 @@ class SportsBot(commands.Cog):
 
         embed.add_field(name="/serverinfo", value="Displays information about the server.", inline=False)
         embed.add_field(name="/userinfo <user>", value="Displays information about a user.", inline=False)
-        embed.add_field(name="/play <song name or URL>", value="Plays the specified song in the voice channel.", inline=False)
+        embed.add_field(name="/play <song name or URL>", value="Plays the specified song, or queues a whole playlist or album link, in the voice channel.", inline=False)
         embed.add_field(name="/stop", value="Stops the currently playing track.", inline=False)
         embed.add_field(name="/pause", value="Pauses the currently playing track.", inline=False)
         embed.add_field(name="/resume", value="Resumes the currently paused track.", inline=False)
-        embed.add_field(name="/queue", value="Shows the current music queue.", inline=False)
+        embed.add_field(name="/queue [page]", value="Shows the current music queue.", inline=False)
+        embed.add_field(name="/remove <position>", value="Removes a track from the queue.", inline=False)
+        embed.add_field(name="/move <position> <new position>", value="Moves a track within the queue.", inline=False)
+        embed.add_field(name="/shuffle", value="Shuffles the queue.", inline=False)
         embed.add_field(name="/skip", value="Skips the currently playing track.", inline=False)
         embed.add_field(name="/matches <YYYY-MM-DD>", value="Finds games played for both NFL and NBA on a specific date.", inline=False)
         embed.add_field(name="/search <sport> <team name>", value="Searches for a specific team to display information.", inline=False)
         embed.add_field(name="/odds <sport>", value="Shows the current odds for that sport.", inline=False)
         embed.add_field(name="/news <sport>", value="Shows the current news for that sport.", inline=False)
         embed.add_field(name="/scores", value="Will show the Live and Final scores for the NFL.", inline=False)
+        embed.add_field(name="/predict [date]", value="Shows the NBA predictions for today or another date, with the pick record.", inline=False)
+        embed.add_field(name="/ratings [team]", value="Shows the NBA Elo power ratings, or one team's rating.", inline=False)
         embed.add_field(name="/embed", value="Send an Embedded Message to a Channel of your choice", inline=False)
         embed.add_field(name="/react", value="Send a reaction-role message to a pre-defined channel", inline=False)
 
@@ -322,9 +361,10 @@ class SportsBot(commands.Cog):
     # --------------- Command for finding matches provided the date
     @app_commands.command(name="matches", description="Fetch NBA and NFL matches for a given date.")
     @app_commands.describe(date="The date in YYYY-MM-DD format")
+    @app_commands.autocomplete(date=date_autocomplete)
     async def matches(self, interaction: discord.Interaction, date: str):
         """
-        Fetches matches for both NBA and NFL for a given date.
+        Fetches matches for every league for a given date.
         """
         # Validate the date format
         try:
@@ -341,132 +381,105 @@ class SportsBot(commands.Cog):
         )
         embed.set_footer(text="Strategic Investments & Sports Analysis")
 
-        # Fetch NBA matches
-        nba_url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={date.replace('-', '')}"
-        try:
-            nba_response = requests.get(nba_url).json()
-            nba_scores = nba_response.get('events', [])
-
-            if nba_scores:
-                nba_matches = ""
-                for game in nba_scores:
-                    competition = game.get('competitions', [])[0]
-                    home_team = competition['competitors'][0]['team']['displayName']
-                    away_team = competition['competitors'][1]['team']['displayName']
-                    home_score = competition['competitors'][0]['score']
-                    away_score = competition['competitors'][1]['score']
-                    status = competition.get('status', {}).get('type', {}).get('description', 'Scheduled')
-                    nba_matches += f"**{home_team}** {home_score} vs **{away_team}** {away_score} ({status})\n"
-                embed.add_field(name="NBA", value=nba_matches, inline=False)
-            else:
-                embed.add_field(name="NBA", value="No NBA matches found for this date.", inline=False)
+        # Fetch every league's scoreboard at the same time
+        results = await asyncio.gather(
+            *(self._fetch_matches(key, date) for key in LEAGUES), return_exceptions=True
+        )
 
-        except Exception as e:
-            await interaction.response.send_message(f"Error fetching matches for NBA: {e}", ephemeral=True)
-            return
+        for key, result in zip(LEAGUES, results):
+            name = LEAGUES[key]['name']
+            if isinstance(result, Exception):
+                await interaction.response.send_message(f"Error fetching matches for {name}: {result}", ephemeral=True)
+                return
+            embed.add_field(name=name, value=result or f"No {name} matches found for this date.", inline=False)
 
-        # Fetch NFL matches
-        nfl_url = f"http://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?dates={date.replace('-', '')}"
-        try:
-            nfl_response = requests.get(nfl_url).json()
-            nfl_scores = nfl_response.get('events', [])
-
-            if nfl_scores:
-                nfl_matches = ""
-                for game in nfl_scores:
-                    competition = game.get('competitions', [])[0]
-                    home_team = competition['competitors'][0]['team']['displayName']
-                    away_team = competition['competitors'][1]['team']['displayName']
-                    home_score = competition['competitors'][0]['score']
-                    away_score = competition['competitors'][1]['score']
-                    status = competition.get('status', {}).get('type', {}).get('description', 'Scheduled')
-                    nfl_matches += f"**{home_team}** {home_score} vs **{away_team}** {away_score} ({status})\n"
-                embed.add_field(name="NFL", value=nfl_matches, inline=False)
-            else:
-                embed.add_field(name="NFL", value="No NFL matches found for this date.", inline=False)
+        await interaction.response.send_message(embed=embed)
 
-        except Exception as e:
-            await interaction.response.send_message(f"Error fetching matches for NFL: {e}", ephemeral=True)
+    async def _fetch_matches(self, key, date):
+        """Fetch one league's scoreboard for a date and format it as embed text."""
+        events = await get_scoreboard(key, date)
+
+        matches = ""
+        for game in events:
+            competition = game.get('competitions', [])[0]
+            home_team = competition['competitors'][0]['team']['displayName']
+            away_team = competition['competitors'][1]['team']['displayName']
+            home_score = competition['competitors'][0]['score']
+            away_score = competition['competitors'][1]['score']
+            status = competition.get('status', {}).get('type', {}).get('description', 'Scheduled')
+            matches += f"**{home_team}** {home_score} vs **{away_team}** {away_score} ({status})\n"
+        return matches
+
+    # --------------- Command to archive a whole season of scoreboards for /matches
+    @app_commands.command(name="backfill", description="Archive a full season of NBA or NFL scoreboards.")
+    @app_commands.describe(sport="The sport to archive (NBA or NFL)", season="The year the season started, e.g. 2023")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.autocomplete(sport=sport_autocomplete)
+    async def backfill(self, interaction: discord.Interaction, sport: str, season: int):
+        """Load every finished date of a season into the local archive."""
+        sport = sport.lower()
+        if not get_league(sport):
+            await interaction.response.send_message(f"Invalid sport. Please use {league_names()}.", ephemeral=True)
             return
 
-        await interaction.response.send_message(embed=embed)
+        await interaction.response.defer(ephemeral=True)
+        fetched = await backfill_season(sport, season)
+        await interaction.followup.send(
+            f"Archived the {season} {sport.upper()} season ({fetched} new dates fetched).", ephemeral=True
+        )
 
     # --------------- Command to search through available sports and teams for information
     @app_commands.command(name="search", description="Search for a team in NBA or NFL.")
     @app_commands.describe(sport="The sport to search (NBA or NFL)", team_name="The team name to search")
+    @app_commands.autocomplete(sport=sport_autocomplete, team_name=team_autocomplete)
     async def search(self, interaction: discord.Interaction, sport: str, team_name: str = None):
         """Search for a specific team or list available teams."""
         sport = sport.lower()
-        if sport not in ["nba", "nfl"]:
-            await interaction.response.send_message("Invalid sport. Please use 'NBA' or 'NFL'.", ephemeral=True)
+        if not get_league(sport):
+            await interaction.response.send_message(f"Invalid sport. Please use {league_names()}.", ephemeral=True)
             return
 
         if not team_name:
             await self.show_available_teams(interaction, sport)
             return
 
-        if sport == "nba":
-            await self.search_nba_team(interaction, team_name)
-        elif sport == "nfl":
-            await self.search_nfl_team(interaction, team_name)
+        await self._search_team(interaction, team_name, sport)
 
     async def show_available_teams(self, interaction: discord.Interaction, sport: str):
-        """Show available teams for NBA or NFL."""
-        url = (
-            "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams"
-            if sport == "nba" else
-            "http://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
-        )
-        response = requests.get(url).json()
-        teams = response['sports'][0]['leagues'][0]['teams']
+        """Show available teams for a league."""
+        teams = await fetch_teams(sport)
         team_names = [team['team']['displayName'] for team in teams]
         description = "\n".join(team_names) if team_names else "No teams found."
 
         embed = discord.Embed(
             title=f"Available {sport.upper()} Teams",
             description=description,
-            color=discord.Color.blue() if sport == "nba" else discord.Color.green()
+            color=LEAGUES[sport]['colors']['teams']
         )
         await interaction.response.send_message(embed=embed)
 
-    async def search_nba_team(self, interaction: discord.Interaction, team_name: str):
-        """Search and display NBA team information."""
-        await self._search_team(interaction, team_name, "nba")
-
-    async def search_nfl_team(self, interaction: discord.Interaction, team_name: str):
-        """Search and display NFL team information."""
-        await self._search_team(interaction, team_name, "nfl")
-
     async def _search_team(self, interaction: discord.Interaction, team_name: str, sport: str):
         """Fetch and display team details."""
-        url = (
-            "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams"
-            if sport == "nba" else
-            "http://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
-        )
-        response = requests.get(url).json()
-        teams = response['sports'][0]['leagues'][0]['teams']
-
-        team_info = next(
-            (team['team'] for team in teams if team_name.lower() in team['team']['displayName'].lower()), None
-        )
+        index = await get_team_index(sport)
+        team_info = index.lookup(team_name)
 
         if not team_info:
-            await interaction.response.send_message(f"No team found with the name: {team_name}", ephemeral=True)
+            suggestions = [team['displayName'] for team, _ in index.search(team_name)]
+            message = f"No team found with the name: {team_name}"
+            if suggestions:
+                message += "\nDid you mean: " + ", ".join(suggestions) + "?"
+            await interaction.response.send_message(message, ephemeral=True)
             return
 
-        # Fetch scoreboard data
-        scoreboard_url = (
-            "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
-            if sport == "nba" else
-            "http://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-        )
-        scores_response = requests.get(scoreboard_url).json()
+        # Scoreboard data from the live score engine, or ESPN before its first poll
+        events = get_events(sport)
+        if events is None:
+            events = (await fetch_espn(sport, 'scoreboard')).get('events', [])
 
         past_games = []
         upcoming_match = None
 
-        for game in scores_response.get('events', []):
+        for game in events:
             home_team = game['competitions'][0]['competitors'][0]
             away_team = game['competitions'][0]['competitors'][1]
             if home_team['team']['id'] == team_info['id'] or away_team['team']['id'] == team_info['id']:
@@ -503,55 +516,45 @@ class SportsBot(commands.Cog):
     # --------------- Command to find the current odds for a desired sport
     @app_commands.command(name="odds", description="Fetch the latest odds for NBA or NFL.")
     @app_commands.describe(sport="Select the sport (NBA or NFL) to view the latest odds.")
+    @app_commands.autocomplete(sport=sport_autocomplete)
     async def odds(self, interaction: discord.Interaction, sport: str):
         """Responds with the latest odds for the given sport."""
         sport = sport.lower()
 
-        if sport not in ["nba", "nfl"]:
+        if not get_league(sport):
             embed = discord.Embed(
                 title="Invalid Sport",
-                description="Please use a valid sport: `nba` or `nfl`.",
+                description=f"Please use a valid sport: {league_names()}.",
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        # Fetch the odds data
-        odds_embed = None
-        if sport == "nba":
-            odds_embed = await fetch_latest_nba_odds()
-        elif sport == "nfl":
-            odds_embed = await fetch_latest_nfl_odds()
-
-        # Handle errors from the odds function
-        if isinstance(odds_embed, str):
-            odds_embed = discord.Embed(
-                title=f"Error Fetching {sport.upper()} Odds",
-                description=odds_embed,
-                color=discord.Color.red()
-            )
+        await interaction.response.defer()
+
+        # Fetch the odds data, errors come back as an error embed
+        odds_embed = as_embed(sport, 'odds', await fetch_latest_odds(sport, ignore_cache=True))
 
         # Send the odds embed to the user
-        await interaction.response.send_message(embed=odds_embed)
+        await interaction.followup.send(embed=odds_embed)
 
     # --------------- Command to find the scores
     @app_commands.command(name="scores", description="Fetch and display the latest NBA and NFL scores.")
     async def scores(self, interaction: Interaction):
-        """Fetch and send the latest NBA and NFL scores."""
+        """Fetch and send the latest scores for every league."""
         await interaction.response.defer()
 
         try:
-            # Fetch NBA and NFL scores using the helper functions.
-            nba_embed = await nba_scores(interaction.channel)
-            nfl_embed = await nfl_scores(interaction.channel)
-
-            # Send NBA scores if available.
-            if nba_embed:
-                await interaction.followup.send(embed=nba_embed)
+            # Fetch every league's scores at the same time.
+            results = await asyncio.gather(
+                *(fetch_latest_scores(key, ignore_cache=True) for key in LEAGUES)
+            )
 
-            # Send NFL scores if available.
-            if nfl_embed:
-                await interaction.followup.send(embed=nfl_embed)
+            # Send each league's scores if available.
+            for key, result in zip(LEAGUES, results):
+                scores_embed = as_embed(key, 'scores', result)
+                if scores_embed:
+                    await interaction.followup.send(embed=scores_embed)
 
         except Exception as e:
             # Handle errors and provide feedback to the user.
@@ -565,56 +568,70 @@ class SportsBot(commands.Cog):
     # --------------- Command for finding the news of a desired sport
     @app_commands.command(name="news", description="Fetch the latest news for a given sport.")
     @app_commands.describe(sport="The sport to fetch news for (nba or nfl).")
+    @app_commands.autocomplete(sport=sport_autocomplete)
     async def news(self, interaction: discord.Interaction, sport: str):
         """Fetch the latest news for the given sport."""
         await interaction.response.defer()
 
         sport = sport.lower()
 
-        if sport == "nba":
-            news_embed = await fetch_latest_nba_news()
-        elif sport == "nfl":
-            news_embed = await fetch_latest_nfl_news()
-        else:
+        if not get_league(sport):
             embed = discord.Embed(
                 title="Invalid Sport",
-                description="Please use 'nba' or 'nfl'.",
+                description=f"Please use {league_names()}.",
                 color=discord.Color.red()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        if isinstance(news_embed, str):
-            news_embed = discord.Embed(
-                title=f"Error Fetching {sport.upper()} News",
-                description=news_embed,
-                color=discord.Color.red()
-            )
+        news_embed = as_embed(sport, 'news', await fetch_latest_news(sport, ignore_cache=True))
 
         await interaction.followup.send(embed=news_embed)
 
     # --------------- Command for predictions
-    @app_commands.command(name="predict", description="Get today's NBA predictions.")
-    async def predict(self, interaction: discord.Interaction):
-        """Fetch and send NBA predictions for today."""
+    @app_commands.command(name="predict", description="Get NBA predictions for today or another date.")
+    @app_commands.describe(date="The date in YYYY-MM-DD format (defaults to today)")
+    @app_commands.autocomplete(date=date_autocomplete)
+    async def predict(self, interaction: discord.Interaction, date: str = None):
+        """Send the cached NBA predictions for a date, graded if the games are final."""
+        # Validate the date format
+        if date:
+            try:
+                datetime.datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                await interaction.response.send_message("Invalid date format. Please use YYYY-MM-DD.", ephemeral=True)
+                return
+
         await interaction.response.defer()  # Defer the response to handle delays
 
         try:
-            # Generate predictions
-            results = generate_predictions_for_today()
-            nba_results = results.get("nba", "No NBA games today.")
+            # Read the day's slate from the prediction cache
+            slate = await get_slate(date)
+            if isinstance(slate, str):
+                nba_results, day = slate, date
+            else:
+                nba_results = await asyncio.to_thread(grade, slate)
+                nba_results = nba_results or f"No NBA games on {slate['date']}."
+                day = slate['date']
 
             # Format and send the response
-            embed = self.format_prediction_message("NBA", nba_results)
+            embed = self.format_prediction_message("NBA", nba_results, day, await asyncio.to_thread(pick_record))
             await interaction.followup.send(embed=embed)
 
+        except MLServiceBusy:
+            await interaction.followup.send("The prediction service is busy. Please try again shortly.", ephemeral=True)
+
+        except asyncio.TimeoutError:
+            await interaction.followup.send("Predictions took too long to generate. Please try again.", ephemeral=True)
+
         except Exception as e:
             # Handle any exceptions by sending an error message
             await interaction.followup.send(f"Error fetching predictions: {str(e)}", ephemeral=True)
 
-    def format_prediction_message(self, sport, results):
+    def format_prediction_message(self, sport, results, day=None, record=(0, 0)):
         """Format the prediction results into a Discord embed."""
-        embed = discord.Embed(title=f"{sport} Predictions for Today", color=discord.Color.blue())
+        title = f"{sport} Predictions for {day}" if day else f"{sport} Predictions for Today"
+        embed = discord.Embed(title=title, color=discord.Color.blue())
 
         if isinstance(results, str):
             embed.description = results  # Display the error or message if no games are available
@@ -625,9 +642,10 @@ class SportsBot(commands.Cog):
                 away_team = result.get('AwayTeam')
                 moneyline_prediction = result.get('MoneylinePrediction', 'N/A')
                 point_spread = result.get('PointSpread', 'N/A')
+                outcome = {'W': " ✅", 'L': " ❌"}.get(result.get('Result'), "")
 
                 embed.add_field(
-                    name=f"{home_team} vs {away_team}",
+                    name=f"{home_team} vs {away_team}{outcome}",
                     value=(
                         f"**Moneyline:** {moneyline_prediction}\n"
                         f"**Point Spread:** {point_spread}"
@@ -635,9 +653,53 @@ class SportsBot(commands.Cog):
                     inline=False
                 )
 
-        embed.set_footer(text="These values are not real data. Showcase only.")
+        wins, losses = record
+        if wins + losses:
+            embed.set_footer(text=f"Pick record: {wins}-{losses} ({wins / (wins + losses):.1%}). These values are not real data. Showcase only.")
+        else:
+            embed.set_footer(text="These values are not real data. Showcase only.")
         return embed
 
+    # --------------- Command for team ratings
+    @app_commands.command(name="ratings", description="Show NBA Elo power ratings.")
+    @app_commands.describe(team="Team name or abbreviation, e.g. Lakers or LAL (optional)")
+    @app_commands.autocomplete(team=nba_team_autocomplete)
+    async def ratings(self, interaction: discord.Interaction, team: str = None):
+        """Send the live Elo table, or one team's rating and rank."""
+        table = get_ratings().table()
+        if not table:
+            await interaction.response.send_message("Ratings aren't available yet.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title="NBA Elo Ratings", color=discord.Color.blue())
+        if team:
+            abbreviation = await self._rating_abbreviation(team, {row[0] for row in table})
+            rank = next((i for i, row in enumerate(table) if row[0] == abbreviation), None)
+            if rank is None:
+                await interaction.response.send_message(f"No rating found for '{team}'.", ephemeral=True)
+                return
+            name, rating, games, change = table[rank]
+            embed.description = f"**#{rank + 1} {name}** {rating:.0f} ({change:+.1f} last game, {games} games)"
+        else:
+            embed.description = "\n".join(
+                f"`{rank:>2}` **{name}** {rating:.0f} ({change:+.1f})"
+                for rank, (name, rating, _, change) in enumerate(table, start=1)
+            )
+        embed.set_footer(text="Updated as games go final.")
+        await interaction.response.send_message(embed=embed)
+
+    async def _rating_abbreviation(self, team, rated):
+        """The ratings' (sportsdata.io) abbreviation for a team name, alias or ESPN abbreviation."""
+        if team.upper() in rated:
+            return team.upper()
+        try:
+            team_info = (await get_team_index('nba')).lookup(team)
+        except Exception as e:
+            print(f"Error looking up NBA team '{team}': {e}")
+            team_info = None
+        abbreviation = team_info.get('abbreviation', '').upper() if team_info else team.upper()
+        return ESPN_ABBREVIATIONS.get(abbreviation, abbreviation)
+
     # --------------- Command for sending embedded messages):
     @app_commands.command(
         name="embed", 
@@ -680,6 +742,7 @@ class SportsBot(commands.Cog):
 
     # --------------- Command for custom picks to a specific channel
     @app_commands.command(name="picks", description="Create betting picks for NBA or NFL.")
+    @app_commands.autocomplete(sport=sport_autocomplete, team_matchup=matchup_autocomplete)
     async def picks(
         self, 
         interaction: discord.Interaction,
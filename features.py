@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+FORM_WINDOW = 10  # Games in each rolling window
+REST_CAP = 7      # Days; longer breaks (and a team's first game) count as fully rested
+
+# Columns added to a game frame by add_team_form()
+FORM_FEATURES = [
+    'HomeForm', 'AwayForm',              # Point differential over the last FORM_WINDOW games
+    'HomeVenueForm', 'AwayVenueForm',    # The same, home games only for the home team, road games only for the away team
+    'HomePace', 'AwayPace',              # Total points (both teams) over the last FORM_WINDOW games
+    'HomeRest', 'AwayRest',              # Days since the team's previous game
+    'HomeB2B', 'AwayB2B',                # Second night of a back-to-back
+]
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _group_order(keys, dates):
+    """Row order grouping by key, then by date; ties keep their original order."""
+    return np.lexsort((np.arange(len(keys)), dates, keys))
+
+
+def _group_starts(keys):
+    """For rows sorted by key, the index of the first row of each row's group."""
+    index = np.arange(len(keys))
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    return np.maximum.accumulate(np.where(first, index, 0))
+
+
+def _rolling_mean(values, starts, window):
+    """Mean of each row's previous `window` non-NaN values in its group, excluding the row itself.
+
+    Rows must be sorted by group and date. Uses prefix sums, so the cost is
+    O(n) whatever the window.
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+
+    index = np.arange(len(values))
+    low = np.maximum(index - window, starts)
+    total = sums[index] - sums[low]
+    n = counts[index] - counts[low]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, total / np.maximum(n, 1), np.nan)
+
+
+def _grouped(keys, dates, values, window):
+    """Rolling mean of `values` within each key, returned in the original row order."""
+    order = _group_order(keys, dates)
+    result = np.empty(len(values))
+    result[order] = _rolling_mean(values[order], _group_starts(keys[order]), window)
+    return result
+
+
+def _rest_days(keys, dates):
+    order = _group_order(keys, dates)
+    sorted_dates = dates[order]
+    starts = _group_starts(keys[order])
+
+    index = np.arange(len(order))
+    previous = np.maximum(index - 1, 0)
+    gap = (sorted_dates - sorted_dates[previous]).astype('timedelta64[D]').astype(float)
+    gap[index == starts] = REST_CAP
+
+    rest = np.empty(len(order))
+    rest[order] = np.clip(gap, 0, REST_CAP)
+    return rest
+
+
+def team_form(home_codes, away_codes, dates, home_scores, away_scores, window=FORM_WINDOW):
+    """Rolling team-form features for each game, from games played before it.
+
+    Every game is split into one row per team, the rows are grouped by team
+    and date, and all statistics come from prefix sums over those groups, so
+    no Python loop runs per game or per team. Games without scores (upcoming
+    games) get features from the games before them and don't contribute any.
+
+    Returns a dict of FORM_FEATURES -> float arrays aligned with the input.
+    """
+    n = len(home_codes)
+    teams = np.concatenate([home_codes, away_codes]).astype(np.int64)
+    is_home = np.concatenate([np.ones(n, dtype=np.int64), np.zeros(n, dtype=np.int64)])
+    days = np.concatenate([dates, dates]).astype('datetime64[D]')
+    scored = np.concatenate([home_scores, away_scores]).astype(float)
+    allowed = np.concatenate([away_scores, home_scores]).astype(float)
+
+    form = _grouped(teams, days, scored - allowed, window)
+    venue_form = _grouped(teams * 2 + is_home, days, scored - allowed, window)
+    pace = _grouped(teams, days, scored + allowed, window)
+    rest = _rest_days(teams, days)
+
+    # Teams without history yet: even form, league-average pace
+    form = np.nan_to_num(form)
+    venue_form = np.nan_to_num(venue_form)
+    pace = np.where(np.isnan(pace), np.nanmean(pace) if np.isfinite(pace).any() else 0.0, pace)
+
+    return {
+        'HomeForm': form[:n], 'AwayForm': form[n:],
+        'HomeVenueForm': venue_form[:n], 'AwayVenueForm': venue_form[n:],
+        'HomePace': pace[:n], 'AwayPace': pace[n:],
+        'HomeRest': rest[:n], 'AwayRest': rest[n:],
+        'HomeB2B': (rest[:n] == 1).astype(float), 'AwayB2B': (rest[n:] == 1).astype(float),
+    }
+
+
+def add_team_form(df, history=None, window=FORM_WINDOW):
+    """Add FORM_FEATURES to a game frame.
+
+    `df` needs HomeTeamCode, AwayTeamCode and DateTime, plus HomeTeamScore and
+    AwayTeamScore for completed games. When predicting, pass the completed games
+    as `history` (encoded with the same team codes); only the ones played
+    before the first day in `df` are used, so a past slate sees exactly what
+    was known on the day.
+    """
+    dates = pd.to_datetime(df['DateTime']).to_numpy().astype('datetime64[D]')
+    home_scores = _scores(df, 'HomeTeamScore')
+    away_scores = _scores(df, 'AwayTeamScore')
+    home_codes = df['HomeTeamCode'].to_numpy()
+    away_codes = df['AwayTeamCode'].to_numpy()
+
+    if history is not None and len(history) and len(df):
+        past_dates = pd.to_datetime(history['DateTime']).to_numpy().astype('datetime64[D]')
+        past = past_dates < dates.min()
+        home_codes = np.concatenate([history['HomeTeamCode'].to_numpy()[past], home_codes])
+        away_codes = np.concatenate([history['AwayTeamCode'].to_numpy()[past], away_codes])
+        dates = np.concatenate([past_dates[past], dates])
+        home_scores = np.concatenate([_scores(history, 'HomeTeamScore')[past], home_scores])
+        away_scores = np.concatenate([_scores(history, 'AwayTeamScore')[past], away_scores])
+
+    features = team_form(home_codes, away_codes, dates, home_scores, away_scores, window)
+    for name in FORM_FEATURES:
+        df[name] = features[name][len(features[name]) - len(df):]
+    return df
+
+
+def _scores(df, column):
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[column].to_numpy(dtype=float, na_value=np.nan)
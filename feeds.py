@@ -0,0 +1,306 @@
+import asyncio
+from datetime import datetime, timezone
+import discord
+from discord.ext import tasks
+from http_client import fetch_json
+from cache import fetch_espn
+from changes import ChangeTracker, news_entities, score_entities
+from line_moves import LineTracker, format_move
+from odds_quota import quota, snapshots, next_poll_delay
+from live_scores import get_events
+from leagues import LEAGUES, odds_url
+from security import ODDS_API_KEY
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# Per-entity fingerprints of the last fetched data, keyed by (league key, feed name)
+trackers = {}
+
+# Last published odds line per league, used to post only the games whose lines moved
+line_trackers = {}
+
+# Scheduled loops by name. on_ready fires again after a gateway reconnect, and a
+# fresh tasks.loop object would never report is_running(), so each is made once.
+_loops = {}
+
+MAX_MOVED_GAMES = 10   # Games per "line moved" embed
+MAX_MOVES_PER_GAME = 6 # Lines listed per game
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _changed(key, feed, entities):
+    """Record the feed's entities and return the ids that changed since last time."""
+    tracker = trackers.setdefault((key, feed), ChangeTracker())
+    return tracker.update(entities)
+
+
+async def refresh_odds(key):
+    """Poll the-odds-api for a league, record the quota it reports and store a snapshot."""
+    league = LEAGUES[key]
+    params = {
+        "regions": "us",
+        "markets": league['markets'],
+        "oddsFormat": "american",
+        "apiKey": ODDS_API_KEY
+    }
+    data, headers = await fetch_json(odds_url(key), params=params, with_headers=True)
+    quota.record(key, league['markets'].split(','), headers)
+    snapshots[key] = {'data': data, 'fetched_at': datetime.now(timezone.utc)}
+    return data
+
+
+async def fetch_latest_odds(key, ignore_cache=False, seed=False):
+    """Fetch the latest odds for a league and return an embed if they changed.
+
+    On-demand requests (ignore_cache=True) are answered from the most recent
+    snapshot when there is one, so they don't spend API credits. With
+    seed=True the full board also becomes the line-move baseline.
+    """
+    league = LEAGUES[key]
+    try:
+        snapshot = snapshots.get(key)
+        if ignore_cache and snapshot:
+            data = snapshot['data']
+        else:
+            data = await refresh_odds(key)
+
+        if not data:
+            return f"No {league['name']} odds data found." if ignore_cache else None
+
+        # Scheduled updates only post games whose lines moved. On-demand requests
+        # get the full board and leave the published baselines alone.
+        if not ignore_cache or seed:
+            tracker = line_trackers.setdefault(key, LineTracker(league.get('line_move_thresholds')))
+            moves = tracker.update(data)
+            if not ignore_cache:
+                return _line_moves_embed(league, data, moves) if moves else None  # None if no lines moved.
+
+        embed = discord.Embed(title=f"{league['name']} Odds", color=league['colors']['odds'])
+        for game in data[:5]:  # Safely access the first 5 games
+            home_team = game.get('home_team')
+            away_team = game.get('away_team')
+            bookmakers = game.get('bookmakers', [])
+
+            if bookmakers and bookmakers[0].get('markets'):
+                outcomes = bookmakers[0]['markets'][0].get('outcomes', [])
+                home_odds = next((o['price'] for o in outcomes if o['name'] == home_team), 'N/A')
+                away_odds = next((o['price'] for o in outcomes if o['name'] == away_team), 'N/A')
+            else:
+                home_odds, away_odds = 'N/A', 'N/A'
+
+            commence_time = game.get('commence_time', 'N/A')
+
+            description = (
+                f"Odds for {home_team} vs {away_team}\n"
+                f"Home: {home_team} ({home_odds})\n"
+                f"Away: {away_team} ({away_odds})\n"
+                f"Game Time: {commence_time}"
+            )
+            embed.add_field(name=f"{home_team} vs {away_team}", value=description, inline=False)
+
+        fetched_at = snapshots[key]['fetched_at']
+        embed.set_footer(text=f"Odds as of {fetched_at:%Y-%m-%d %H:%M} UTC")
+        return embed
+
+    except Exception as e:
+        return f"Error fetching {league['name']} odds: {e}"
+
+
+def _line_moves_embed(league, games, moves):
+    """Compact embed listing only the games whose lines moved."""
+    embed = discord.Embed(title=f"{league['name']} Line Moves", color=league['colors']['odds'])
+    moved_games = [game for game in games if game.get('id') in moves][:MAX_MOVED_GAMES]
+
+    for game in moved_games:
+        game_moves = moves[game['id']]
+        lines = [format_move(move) for move in game_moves[:MAX_MOVES_PER_GAME]]
+        if len(game_moves) > MAX_MOVES_PER_GAME:
+            lines.append(f"...and {len(game_moves) - MAX_MOVES_PER_GAME} more")
+        embed.add_field(
+            name=f"{game.get('home_team')} vs {game.get('away_team')}",
+            value="\n".join(lines)[:1024],
+            inline=False
+        )
+
+    if len(moves) > len(moved_games):
+        embed.set_footer(text=f"{len(moves) - len(moved_games)} more games moved.")
+    return embed
+
+
+async def fetch_latest_news(key, ignore_cache=False, seed=False):
+    """Fetch the latest news for a league and return an embed if it changed.
+
+    Only scheduled updates (and the startup post, with seed=True) advance the
+    change tracker, so /news doesn't keep articles out of the news channel.
+    """
+    league = LEAGUES[key]
+    try:
+        data = await fetch_espn(key, 'news')
+        articles = data.get('articles', [])
+
+        if not articles:
+            return f"No {league['name']} news available." if ignore_cache else None
+
+        if not ignore_cache or seed:
+            changed = _changed(key, 'news', news_entities(articles))
+        if not ignore_cache:
+            articles = [a for a in articles if a.get('id', a.get('headline')) in changed]
+            if not articles:
+                return None  # No new news available.
+
+        embed = discord.Embed(title=f"{league['name']} News", color=league['colors']['news'])
+        for article in articles[:5]:
+            title = article.get('headline', 'No title')
+            description = article.get('description', 'No description available')
+            link = article.get('links', {}).get('web', {}).get('href', 'No link available')
+            embed.add_field(name=title, value=f"{description}\n[Read more]({link})", inline=False)
+
+        return embed
+
+    except Exception as e:
+        return f"Error fetching {league['name']} news: {e}"
+
+
+async def fetch_latest_scores(key, ignore_cache=False, seed=False):
+    """Return the latest scores for a league as an embed if they changed.
+
+    Scores come from the live score engine's in-memory scoreboard; the network
+    is only used before its first poll has completed. As with news, only
+    scheduled updates and seed=True advance the change tracker.
+    """
+    league = LEAGUES[key]
+    try:
+        games = get_events(key)
+        if games is None:
+            data = await fetch_espn(key, 'scoreboard')
+            games = data.get('events', [])
+
+        if not games:
+            return f"No {league['name']} games found." if ignore_cache else None
+
+        if not ignore_cache or seed:
+            changed = _changed(key, 'scores', score_entities(games))
+        if not ignore_cache:
+            games = [game for game in games if game.get('id') in changed]
+            if not games:
+                return None  # No new data found.
+
+        embed = discord.Embed(title=f"{league['name']} Scores", color=league['colors']['scores'])
+        for game in games[:5]:  # Limit to the top 5 games
+            home_team = game['competitions'][0]['competitors'][0]['team']['displayName']
+            away_team = game['competitions'][0]['competitors'][1]['team']['displayName']
+            home_score = game['competitions'][0]['competitors'][0]['score']
+            away_score = game['competitions'][0]['competitors'][1]['score']
+            status = game['status']['type']['name']
+
+            description = (
+                f"{home_team} vs {away_team}\n"
+                f"Score: {home_score} - {away_score}\n"
+                f"Status: {status}"
+            )
+            embed.add_field(name=f"{home_team} vs {away_team}", value=description, inline=False)
+
+        return embed
+
+    except Exception as e:
+        return f"Error fetching {league['name']} scores: {e}"
+
+
+# Feed name -> fetcher. Every feed that has a channel in the registry is published.
+FEEDS = {
+    'odds': fetch_latest_odds,
+    'news': fetch_latest_news,
+    'scores': fetch_latest_scores,
+}
+
+
+def as_embed(key, feed, result):
+    """Turn a fetcher's error string into an error embed; pass embeds through."""
+    if isinstance(result, str):
+        return discord.Embed(
+            title=f"Error Fetching {LEAGUES[key]['name']} {feed.capitalize()}",
+            description=result,
+            color=discord.Color.red()
+        )
+    return result
+
+
+async def _publish(bot, key, feed, channel_id, ignore_cache):
+    """Fetch one league feed and send it to its channel if there is anything new.
+
+    A full post (ignore_cache=True, at startup) seeds the feed's tracker, so the
+    next scheduled update only posts what changed after it.
+    """
+    embed = as_embed(key, feed, await FEEDS[feed](key, ignore_cache=ignore_cache, seed=ignore_cache))
+    channel = bot.get_channel(channel_id)
+    if embed and channel:
+        await channel.send(embed=embed)
+
+
+async def publish_feeds(bot, ignore_cache=False, feeds=None):
+    """Fetch every league and feed concurrently and post updates to their channels."""
+    jobs = [
+        _publish(bot, key, feed, channel_id, ignore_cache)
+        for key, league in LEAGUES.items()
+        for feed, channel_id in league['channels'].items()
+        if feeds is None or feed in feeds
+    ]
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error publishing feed: {result}")
+
+
+def start_feed_updates(bot):
+    """Start the scheduled task that publishes all league feeds."""
+    if 'feeds' in _loops:
+        return
+
+    @tasks.loop(minutes=360)
+    async def update_feeds():
+        print("Feed update loop is running...")
+        await publish_feeds(bot, feeds=[feed for feed in FEEDS if feed != 'odds'])
+
+    _loops['feeds'] = update_feeds
+    update_feeds.start()
+    print("Feed updates loop has started.")
+
+
+def start_odds_updates(bot):
+    """Start one adaptive odds loop per league, paced by the remaining API quota."""
+    for key, league in LEAGUES.items():
+        _odds_loop(bot, key, league)
+
+
+def _odds_loop(bot, key, league):
+    if ('odds', key) in _loops:
+        return
+    markets = league['markets'].split(',')
+
+    @tasks.loop(seconds=next_poll_delay(key, markets, leagues=len(LEAGUES)))
+    async def update_odds():
+        try:
+            await _publish(bot, key, 'odds', league['channels']['odds'], ignore_cache=False)
+        except Exception as e:
+            print(f"Error updating {league['name']} odds: {e}")
+
+        delay = next_poll_delay(key, markets, leagues=len(LEAGUES))
+        update_odds.change_interval(seconds=delay)
+        print(f"{league['name']} odds: next poll in {delay / 60:.0f} min, {quota.remaining} credits left.")
+
+    @update_odds.before_loop
+    async def wait_for_snapshot():
+        # tasks.loop runs its first iteration at once; the startup post has usually just
+        # paid for a snapshot, so wait until it is one poll interval old.
+        snapshot = snapshots.get(key)
+        if snapshot:
+            age = (datetime.now(timezone.utc) - snapshot['fetched_at']).total_seconds()
+            await asyncio.sleep(max(0.0, next_poll_delay(key, markets, leagues=len(LEAGUES)) - age))
+
+    _loops['odds', key] = update_odds
+    update_odds.start()
+    print(f"{league['name']} odds loop has started.")
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+from predictions import fetch_data, FINAL_STATUSES
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+STORE_DIR = os.path.join('data', 'games')
+TEAMS_FILE = 'teams.json'  # Append-only team vocabulary, so codes never change
+CURRENT_FILE = 'CURRENT'   # Names the version directory readers use; replaced last, atomically
+KEEP_VERSIONS = 2          # Older versions are deleted; open memory maps keep working on POSIX
+FETCH_CONCURRENCY = 8
+
+# --------------- Column name -> dtype. One memory-mapped .npy file per column.
+COLUMNS = {
+    'game_id': np.int64,
+    'season': np.int16,
+    'date': 'datetime64[D]',
+    'home_code': np.int16,
+    'away_code': np.int16,
+    'home_score': np.float32,
+    'away_score': np.float32,
+    'home_moneyline': np.float32,  # Closing odds; NaN when the feed has none
+    'away_moneyline': np.float32,
+    'point_spread': np.float32,
+    'over_under': np.float32,
+}
+
+# -------------------------------------------------------------------------
+# ------------------------------ Data Sources -----------------------------
+# -------------------------------------------------------------------------
+
+class SportsDataSource:
+    """sportsdata.io NBA endpoints."""
+
+    async def season(self, season):
+        return await fetch_data(f'/scores/json/Games/{season}') or []
+
+    async def date(self, day):
+        return await fetch_data(f'/scores/json/GamesByDate/{day}') or []
+
+
+class LocalSource:
+    """Reads the same payloads from JSON files, for offline runs and tests.
+
+    Expects Games_<season>.json and GamesByDate_<YYYY-MM-DD>.json in `directory`;
+    missing files count as no games.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _read(self, name):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    async def season(self, season):
+        return self._read(f'Games_{season}.json')
+
+    async def date(self, day):
+        return self._read(f'GamesByDate_{day}.json')
+
+# -------------------------------------------------------------------------
+# ------------------------------ Game Store -------------------------------
+# -------------------------------------------------------------------------
+
+class GameStore:
+    """Completed games as columnar NumPy arrays on disk, read back memory-mapped.
+
+    Each append writes a complete new version directory (v1, v2, ...) and then
+    points CURRENT at it, so a reader that resolves CURRENT once always sees
+    columns of one length and the team list they were written with.
+    """
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+
+    def _version(self):
+        """The directory of the current version; the store itself if it predates versions."""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return os.path.join(self.directory, f.read().strip())
+        except FileNotFoundError:
+            return self.directory
+
+    @staticmethod
+    def _path(version, column):
+        return os.path.join(version, f'{column}.npy')
+
+    @staticmethod
+    def _read_teams(version):
+        try:
+            with open(os.path.join(version, TEAMS_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _read_columns(self, version):
+        if not os.path.exists(self._path(version, 'game_id')):
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {name: np.load(self._path(version, name), mmap_mode='r') for name in COLUMNS}
+
+    def snapshot(self):
+        """(columns, teams) from the same version of the store."""
+        version = self._version()
+        return self._read_columns(version), self._read_teams(version)
+
+    def teams(self):
+        return self._read_teams(self._version())
+
+    def columns(self):
+        """Every column as a read-only memory-mapped array (zero-copy)."""
+        return self._read_columns(self._version())
+
+    def __len__(self):
+        return len(self.columns()['game_id'])
+
+    def last_date(self):
+        dates = self.columns()['date']
+        return dates.max().astype(date) if len(dates) else None
+
+    def append(self, games):
+        """Append completed games that aren't stored yet. Returns the number added."""
+        existing, teams = self.snapshot()
+        codes = {team: code for code, team in enumerate(teams)}
+
+        rows = []
+        seen = set(existing['game_id'].tolist())
+        for game in games:
+            if game.get('Status') not in FINAL_STATUSES or game.get('GameID') in seen:
+                continue
+            seen.add(game['GameID'])
+            for team in (game['HomeTeam'], game['AwayTeam']):
+                if team not in codes:
+                    codes[team] = len(teams)
+                    teams.append(team)
+            rows.append(game)
+
+        if not rows:
+            return 0
+
+        new = {
+            'game_id': [g['GameID'] for g in rows],
+            'season': [g.get('Season', 0) for g in rows],
+            'date': [(g.get('Day') or g['DateTime'])[:10] for g in rows],
+            'home_code': [codes[g['HomeTeam']] for g in rows],
+            'away_code': [codes[g['AwayTeam']] for g in rows],
+            'home_score': [g.get('HomeTeamScore') for g in rows],
+            'away_score': [g.get('AwayTeamScore') for g in rows],
+            'home_moneyline': [g.get('HomeTeamMoneyLine') for g in rows],
+            'away_moneyline': [g.get('AwayTeamMoneyLine') for g in rows],
+            'point_spread': [g.get('PointSpread') for g in rows],
+            'over_under': [g.get('OverUnder') for g in rows],
+        }
+
+        # Keep the store sorted by date so rolling features can read it in order.
+        dates = np.concatenate([np.asarray(existing['date']), _to_array(new['date'], COLUMNS['date'])])
+        order = np.argsort(dates, kind='stable')
+
+        # Write a whole new version, then switch readers to it in one rename.
+        versions = self._versions()
+        name = f'v{versions[-1][0] + 1 if versions else 1}'
+        version = os.path.join(self.directory, name)
+        shutil.rmtree(version, ignore_errors=True)  # Left by an append that was interrupted
+        os.makedirs(version)
+        for column, dtype in COLUMNS.items():
+            values = np.concatenate([np.asarray(existing[column]), _to_array(new[column], dtype)])
+            np.save(self._path(version, column), values[order])
+        with open(os.path.join(version, TEAMS_FILE), 'w') as f:
+            json.dump(teams, f)
+
+        tmp = os.path.join(self.directory, CURRENT_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            f.write(name)
+        os.replace(tmp, os.path.join(self.directory, CURRENT_FILE))
+        self._prune()
+        return len(rows)
+
+    def _versions(self):
+        """[(number, directory name)] of every version on disk, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = [(int(entry[1:]), entry) for entry in os.listdir(self.directory)
+                 if entry.startswith('v') and entry[1:].isdigit()]
+        return sorted(found)
+
+    def _prune(self):
+        """Delete all but the newest KEEP_VERSIONS versions, and the pre-version files."""
+        for _, name in self._versions()[:-KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        for legacy in [self._path(self.directory, column) for column in COLUMNS] + [os.path.join(self.directory, TEAMS_FILE)]:
+            if os.path.exists(legacy):
+                os.remove(legacy)
+
+    def frame(self):
+        """The store as a DataFrame over the memory-mapped columns.
+
+        Team columns are categoricals built from the stored codes, so their
+        encoding is identical across runs.
+        """
+        columns, teams = self.snapshot()
+        df = pd.DataFrame({
+            'GameID': columns['game_id'],
+            'Season': columns['season'],
+            'DateTime': columns['date'].astype('datetime64[ns]'),
+            'HomeTeam': pd.Categorical.from_codes(columns['home_code'], categories=teams),
+            'AwayTeam': pd.Categorical.from_codes(columns['away_code'], categories=teams),
+            'HomeTeamScore': columns['home_score'],
+            'AwayTeamScore': columns['away_score'],
+            'HomeMoneyLine': columns['home_moneyline'],
+            'AwayMoneyLine': columns['away_moneyline'],
+            'PointSpread': columns['point_spread'],
+            'OverUnder': columns['over_under'],
+        }, copy=False)
+        df['Outcome'] = (df['HomeTeamScore'] > df['AwayTeamScore']).astype(np.int8)
+        return df
+
+
+# Shared store for the bot
+game_store = GameStore()
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _to_array(values, dtype):
+    if np.dtype(dtype).kind == 'f':
+        values = [np.nan if v is None else v for v in values]  # Missing odds/scores become NaN
+    return np.array(values, dtype=dtype)
+
+
+async def backfill_seasons(seasons, source=None, store=None):
+    """Load whole seasons into the store, fetching them concurrently."""
+    source = source or SportsDataSource()
+    store = store or game_store
+    results = await asyncio.gather(*(source.season(season) for season in seasons))
+    return await asyncio.to_thread(store.append, [game for games in results for game in games])
+
+
+async def update_store(source=None, store=None, days_if_empty=60):
+    """Append games from the last stored date up to yesterday.
+
+    The last stored date is fetched again in case some of its games weren't
+    final yet; games already in the store are skipped.
+    """
+    source = source or SportsDataSource()
+    store = store or game_store
+    yesterday = datetime.now().date() - timedelta(days=1)
+    start = store.last_date() or yesterday - timedelta(days=days_if_empty)
+    days = [(start + timedelta(days=i)).isoformat() for i in range((yesterday - start).days + 1)]
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(day):
+        async with semaphore:
+            return await source.date(day)
+
+    results = await asyncio.gather(*(fetch(day) for day in days))
+    return await asyncio.to_thread(store.append, [game for games in results for game in games])
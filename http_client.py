@@ -0,0 +1,101 @@
+import asyncio
+import aiohttp
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Connection pool settings shared by every upstream fetch
+MAX_CONNECTIONS = 100           # Total open sockets across all hosts
+MAX_CONNECTIONS_PER_HOST = 10   # ESPN, the-odds-api and sportsdata.io each get their own budget
+KEEPALIVE_SECONDS = 60          # Keep idle connections around between scheduler ticks
+DNS_CACHE_SECONDS = 300
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "discordbotv2",
+}
+
+# The single session used by the whole bot. Created lazily on the running loop.
+_session = None
+
+# Requests currently on the wire, keyed by request_key(). Concurrent callers
+# asking for the same URL and params await the same future (single-flight).
+_in_flight = {}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def get_session():
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONNECTIONS,
+            limit_per_host=MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=KEEPALIVE_SECONDS,
+            ttl_dns_cache=DNS_CACHE_SECONDS,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=REQUEST_TIMEOUT,
+            headers=DEFAULT_HEADERS,
+            auto_decompress=True,
+        )
+    return _session
+
+
+def request_key(url, params=None):
+    """Hashable identity of a GET request."""
+    return (url, tuple(sorted(params.items())) if params else ())
+
+
+async def _get_json(url, params):
+    session = get_session()
+    async with session.get(url, params=params) as response:
+        response.raise_for_status()
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        return await response.json(content_type=None), headers
+
+
+async def fetch_json(url, params=None, with_headers=False):
+    """GET a URL through the shared session and return the decoded JSON body.
+
+    Identical requests made while one is already in flight share that
+    request's result instead of hitting the upstream again, so callers must
+    treat the returned data as read-only.
+
+    With with_headers=True the result is (data, headers) where headers is a
+    dict with lower-cased names.
+
+    Raises aiohttp.ClientResponseError on non-2xx responses, like
+    requests' raise_for_status() did before.
+    """
+    key = request_key(url, params)
+    future = _in_flight.get(key)
+
+    if future is None:
+        future = asyncio.ensure_future(_get_json(url, params))
+        _in_flight[key] = future
+
+        def done(f):
+            _in_flight.pop(key, None)
+            if not f.cancelled():
+                f.exception()  # Mark as retrieved even if every waiter went away
+
+        future.add_done_callback(done)
+
+    # Shield so one cancelled caller doesn't cancel the request for everyone else.
+    data, headers = await asyncio.shield(future)
+    return (data, headers) if with_headers else data
+
+
+async def close_session():
+    """Close the shared session. Called once when the bot shuts down."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,339 @@
+import asyncio
+import os
+import sys
+import aiohttp
+import discord
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Node settings; the defaults match the shipped applications.yml
+# Comma-separated host:port list, e.g. "localhost:2333,music-2:2333"
+LAVALINK_NODES = os.getenv('LAVALINK_NODES', 'localhost:2333')
+LAVALINK_PASSWORD = os.getenv('LAVALINK_PASSWORD', 'youshallnotpass')
+LAVALINK_SECURE = os.getenv('LAVALINK_SECURE', 'false').lower() == 'true'
+# Search source for plain-text queries. The shipped config disables Lavalink's
+# built-in YouTube source, so SoundCloud is the default.
+LAVALINK_SEARCH = os.getenv('LAVALINK_SEARCH', 'scsearch')
+
+CLIENT_NAME = 'discordbotv2'
+API_VERSION = 'v4'
+READY_TIMEOUT = 10           # Seconds to wait for a node's session id
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)  # Seconds between websocket reconnect attempts, the last repeats
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Track end reasons after which the next queued track should start
+# ('replaced' means a new track was already started)
+ADVANCE_REASONS = ('finished', 'loadFailed', 'stopped', 'cleanup')
+
+# ------------------------------------------------------------------------
+# ------------------------------ Node Client ------------------------------
+# ------------------------------------------------------------------------
+
+class LavalinkNode:
+    """One Lavalink server: a websocket for events and stats, REST for everything else."""
+
+    def __init__(self, pool, host, port, password=LAVALINK_PASSWORD, secure=LAVALINK_SECURE):
+        self.pool = pool
+        self.name = f'{host}:{port}'
+        self.rest_url = f"{'https' if secure else 'http'}://{host}:{port}/{API_VERSION}"
+        self.ws_url = f"{'wss' if secure else 'ws'}://{host}:{port}/{API_VERSION}/websocket"
+        self.password = password
+        self.session_id = None
+        self.stats = None
+        self._session = None
+        self._task = None
+        self._ready = asyncio.Event()
+
+    @property
+    def available(self):
+        return self.session_id is not None
+
+    @property
+    def penalty(self):
+        """Lavalink's recommended load score; the node with the lowest gets new players."""
+        if not self.stats:
+            return 0.0
+        penalty = self.stats.get('playingPlayers', 0)
+        penalty += 1.05 ** (100 * self.stats.get('cpu', {}).get('systemLoad', 0)) * 10 - 10
+        frames = self.stats.get('frameStats')
+        if frames:
+            penalty += 1.03 ** (500 * frames.get('deficit', 0) / 3000) * 600 - 600
+            penalty += (1.03 ** (500 * frames.get('nulled', 0) / 3000) * 300 - 300) * 2
+        return penalty
+
+    async def connect(self, user_id):
+        """Open the websocket (reconnecting in the background) and wait for the session id."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(headers={'Authorization': self.password})
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(user_id))
+        await asyncio.wait_for(self._ready.wait(), READY_TIMEOUT)
+
+    async def _run(self, user_id):
+        headers = {'User-Id': str(user_id), 'Client-Name': CLIENT_NAME}
+        attempt = 0
+        while True:
+            try:
+                async with self._session.ws_connect(self.ws_url, headers=headers, heartbeat=30) as ws:
+                    attempt = 0
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle(message.json())
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Lavalink node {self.name} connection error: {e}")
+
+            self.session_id = None
+            self._ready.clear()
+            delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+            attempt += 1
+            print(f"Lavalink node {self.name} disconnected, reconnecting in {delay}s.")
+            await asyncio.sleep(delay)
+
+    def _handle(self, payload):
+        op = payload.get('op')
+        if op == 'ready':
+            self.session_id = payload['sessionId']
+            self._ready.set()
+            print(f"Lavalink node {self.name} ready (session {self.session_id}).")
+        elif op == 'stats':
+            self.stats = payload
+        elif op in ('event', 'playerUpdate'):
+            voice = self.pool.voices.get(int(payload.get('guildId', 0)))
+            if voice is not None:
+                voice.on_payload(payload)
+
+    async def _request(self, method, path, **kwargs):
+        async with self._session.request(method, f'{self.rest_url}{path}', timeout=REQUEST_TIMEOUT, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json() if response.status != 204 else None
+
+    async def load_tracks(self, identifier):
+        """GET /loadtracks: {'loadType': 'track'|'playlist'|'search'|'empty'|'error', 'data': ...}."""
+        return await self._request('GET', '/loadtracks', params={'identifier': identifier})
+
+    async def update_player(self, guild_id, no_replace=False, **body):
+        return await self._request(
+            'PATCH', f'/sessions/{self.session_id}/players/{guild_id}',
+            params={'noReplace': str(no_replace).lower()}, json=body,
+        )
+
+    async def destroy_player(self, guild_id):
+        if self.session_id:
+            await self._request('DELETE', f'/sessions/{self.session_id}/players/{guild_id}')
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+        self.session_id = None
+
+
+class NodePool:
+    """Every configured node, with new players going to the least loaded one."""
+
+    def __init__(self, nodes=LAVALINK_NODES, password=LAVALINK_PASSWORD, secure=LAVALINK_SECURE):
+        self.nodes = []
+        for address in filter(None, (part.strip() for part in nodes.split(','))):
+            host, _, port = address.rpartition(':')
+            self.nodes.append(LavalinkNode(self, host, int(port), password, secure))
+        self.voices = {}  # guild id -> LavalinkVoice
+
+    async def connect(self, user_id):
+        """Connect every node; succeeds if at least one comes up."""
+        results = await asyncio.gather(*(node.connect(user_id) for node in self.nodes), return_exceptions=True)
+        for node, result in zip(self.nodes, results):
+            if isinstance(result, BaseException):
+                print(f"Lavalink node {node.name} is unavailable: {result!r}")
+        if not any(node.available for node in self.nodes):
+            raise ConnectionError("No Lavalink node is available.")
+
+    def best_node(self):
+        available = [node for node in self.nodes if node.available]
+        if not available:
+            raise ConnectionError("No Lavalink node is available.")
+        return min(available, key=lambda node: node.penalty)
+
+    async def search(self, query):
+        """Load a URL or search and return the first track's Lavalink data."""
+        identifier = query if query.startswith(('http://', 'https://')) else f'{LAVALINK_SEARCH}:{query}'
+        result = await self.best_node().load_tracks(identifier)
+        load_type, data = result.get('loadType'), result.get('data')
+        if load_type == 'track':
+            return data
+        if load_type == 'search' and data:
+            return data[0]
+        if load_type == 'playlist' and data.get('tracks'):
+            return data['tracks'][0]
+        if load_type == 'error':
+            raise LookupError(data.get('message') or "Lavalink could not load the track.")
+        raise LookupError(f"No results for '{query}'.")
+
+    async def load_playlist(self, url):
+        """(playlist name, every track's Lavalink data) for a playlist link, or None if it isn't one."""
+        result = await self.best_node().load_tracks(url)
+        if result.get('loadType') != 'playlist':
+            return None
+        data = result['data']
+        return data.get('info', {}).get('name') or url, data.get('tracks', [])
+
+    async def close(self):
+        await asyncio.gather(*(node.close() for node in self.nodes))
+
+
+# Shared pool for the whole bot
+pool = NodePool()
+
+# ------------------------------------------------------------------------
+# ------------------------------ Voice Client ------------------------------
+# ------------------------------------------------------------------------
+
+class LavalinkTrack(discord.AudioSource):
+    """An encoded Lavalink track, handed to LavalinkVoice.play() like a local audio source."""
+
+    def __init__(self, encoded, title=None):
+        self.encoded = encoded
+        self.title = title
+
+    def read(self):
+        return b''  # Lavalink streams the audio to Discord itself
+
+
+class LavalinkVoice(discord.VoiceProtocol):
+    """Voice connection whose audio is sent by a Lavalink node.
+
+    Mirrors the parts of discord.VoiceClient the guild player uses (play with an
+    after-callback, pause, resume, stop and the state checks), so the player
+    doesn't care which backend it drives. Discord's voice events are forwarded
+    to the node, which does the transcoding and buffering.
+    """
+
+    def __init__(self, client, channel):
+        super().__init__(client, channel)
+        self.guild_id = channel.guild.id
+        self.node = pool.best_node()
+        self._voice = {}          # sessionId, token and endpoint for the node
+        self._connected = False
+        self._playing = False
+        self._paused = False
+        self._after = None
+        self._error = None
+        pool.voices[self.guild_id] = self
+
+    # --------------- Discord voice events
+    async def on_voice_state_update(self, data):
+        if data.get('channel_id') is None:
+            self._connected = False
+            return
+        self._voice['sessionId'] = data['session_id']
+        await self._send_voice()
+
+    async def on_voice_server_update(self, data):
+        self._voice['token'] = data['token']
+        self._voice['endpoint'] = data['endpoint']
+        await self._send_voice()
+
+    async def _send_voice(self):
+        if {'sessionId', 'token', 'endpoint'} <= self._voice.keys():
+            await self.node.update_player(self.guild_id, voice=self._voice)
+            self._connected = True
+
+    async def connect(self, *, timeout, reconnect, self_deaf=True, self_mute=False):
+        await self.channel.guild.change_voice_state(channel=self.channel, self_deaf=self_deaf, self_mute=self_mute)
+
+    async def disconnect(self, *, force=False):
+        self._after = None
+        self._playing = self._paused = self._connected = False
+        await self.channel.guild.change_voice_state(channel=None)
+        try:
+            await self.node.destroy_player(self.guild_id)
+        finally:
+            pool.voices.pop(self.guild_id, None)
+            self.cleanup()
+
+    # --------------- Lavalink events
+    def on_payload(self, payload):
+        if payload.get('op') == 'playerUpdate':
+            self._connected = payload.get('state', {}).get('connected', self._connected)
+            return
+
+        event = payload.get('type')
+        if event == 'TrackExceptionEvent':
+            self._error = payload.get('exception', {}).get('message')
+        elif event == 'TrackStuckEvent':
+            self._error = f"Track stuck for {payload.get('thresholdMs')} ms"
+            self._update(track={'encoded': None})
+        elif event == 'TrackEndEvent' and payload.get('reason') in ADVANCE_REASONS:
+            self._playing = self._paused = False
+            after, error, self._error = self._after, self._error, None
+            if after:
+                after(Exception(error) if error else None)
+        elif event == 'WebSocketClosedEvent':
+            print(f"Lavalink voice socket closed in guild {self.guild_id}: {payload.get('reason')}")
+
+    # --------------- Playback, shaped like discord.VoiceClient
+    def _update(self, **body):
+        task = asyncio.get_running_loop().create_task(self.node.update_player(self.guild_id, **body))
+        task.add_done_callback(_log_failure)
+
+    def play(self, source, *, after=None):
+        self._after = after
+        self._playing, self._paused = True, False
+        self._update(track={'encoded': source.encoded}, paused=False)
+
+    def pause(self):
+        self._paused = True
+        self._update(paused=True)
+
+    def resume(self):
+        self._paused = False
+        self._update(paused=False)
+
+    def stop(self):
+        self._update(track={'encoded': None})  # Lavalink answers with TrackEndEvent 'stopped'
+
+    def is_playing(self):
+        return self._playing and not self._paused
+
+    def is_paused(self):
+        return self._playing and self._paused
+
+    def is_connected(self):
+        return self._connected
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _log_failure(task):
+    if not task.cancelled() and task.exception():
+        print(f"Lavalink player update failed: {task.exception()}")
+
+
+async def _check(query):
+    """Connect to the configured nodes, print their load and look a query up."""
+    try:
+        await pool.connect(user_id=0)
+        await asyncio.sleep(1)  # Nodes send their first stats right after 'ready'
+        for node in pool.nodes:
+            print(f"{node.name}: available={node.available} penalty={node.penalty:.1f} stats={node.stats}")
+        track = await pool.search(query)
+        print(f"Found '{track['info']['title']}' by {track['info']['author']} on {pool.best_node().name}")
+    finally:
+        await pool.close()
+
+
+if __name__ == '__main__':
+    # Usage: python lavalink_client.py <query>, against the nodes in LAVALINK_NODES
+    if len(sys.argv) < 2:
+        print("Usage: python lavalink_client.py <search or URL>")
+        sys.exit(1)
+    asyncio.run(_check(' '.join(sys.argv[1:])))
@@ -0,0 +1,78 @@
+import discord
+from security import (
+    DISCORD_CHANNEL_ID_NBA_NEWS,
+    DISCORD_CHANNEL_ID_NBA_ODDS,
+    DISCORD_CHANNEL_ID_NFL_NEWS,
+    DISCORD_CHANNEL_ID_NFL_ODDS,
+)
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+ESPN_BASE_URL = "http://site.api.espn.com/apis/site/v2/sports"
+ODDS_BASE_URL = "https://api.the-odds-api.com/v4/sports"
+
+# --------------- League registry
+# Everything that differs between leagues lives here. Adding a league is a
+# new entry in this dict; the feed engine and commands pick it up from there.
+LEAGUES = {
+    'nba': {
+        'name': 'NBA',
+        'espn_path': 'basketball/nba',
+        'odds_sport': 'basketball_nba',
+        'markets': 'h2h,spreads,totals',
+        'season': ((10, 1), (6, 30)),  # (month, day) the season starts and ends
+        'channels': {
+            'odds': DISCORD_CHANNEL_ID_NBA_ODDS,
+            'news': DISCORD_CHANNEL_ID_NBA_NEWS,
+        },
+        'colors': {
+            'odds': discord.Color.red(),
+            'news': discord.Color.orange(),
+            'scores': discord.Color.blue(),
+            'teams': discord.Color.blue(),
+        },
+    },
+    'nfl': {
+        'name': 'NFL',
+        'espn_path': 'football/nfl',
+        'odds_sport': 'americanfootball_nfl',
+        'markets': 'h2h,spreads',
+        'season': ((9, 1), (2, 28)),
+        'channels': {
+            'odds': DISCORD_CHANNEL_ID_NFL_ODDS,
+            'news': DISCORD_CHANNEL_ID_NFL_NEWS,
+        },
+        'colors': {
+            'odds': discord.Color.green(),
+            'news': discord.Color.orange(),
+            'scores': discord.Color.red(),
+            'teams': discord.Color.green(),
+        },
+    },
+}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def get_league(key):
+    """Return the registry entry for a league key (case-insensitive), or None."""
+    return LEAGUES.get(key.lower()) if key else None
+
+
+def league_names():
+    """Human readable list of supported leagues, e.g. "'NBA' or 'NFL'"."""
+    names = [f"'{league['name']}'" for league in LEAGUES.values()]
+    return ", ".join(names[:-1]) + f" or {names[-1]}" if len(names) > 1 else names[0]
+
+
+def espn_url(key, resource):
+    """ESPN site API URL for a league resource ('scoreboard', 'news', 'teams')."""
+    return f"{ESPN_BASE_URL}/{LEAGUES[key]['espn_path']}/{resource}"
+
+
+def odds_url(key):
+    """the-odds-api URL for a league's odds."""
+    return f"{ODDS_BASE_URL}/{LEAGUES[key]['odds_sport']}/odds"
@@ -0,0 +1,118 @@
+import numpy as np
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Minimum movement that counts as a "line move", per market.
+# 'point' is the spread/total number, 'prob' is the change in the price's implied
+# probability. American prices jump from -100 to +100 around even money, so they
+# can't be compared directly.
+# A league can override these with a 'line_move_thresholds' entry in LEAGUES.
+DEFAULT_THRESHOLDS = {
+    'h2h': {'point': np.inf, 'prob': 0.02},
+    'spreads': {'point': 0.5, 'prob': 0.03},
+    'totals': {'point': 0.5, 'prob': 0.03},
+}
+
+# -------------------------------------------------------------------------
+# ------------------------------ Line Tracker -----------------------------
+# -------------------------------------------------------------------------
+
+class LineTracker:
+    """Tracks the last published line for every game, bookmaker, market and outcome."""
+
+    def __init__(self, thresholds=None):
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self._lines = {}  # (game id, bookmaker, market, outcome) -> (price, point)
+
+    def update(self, games):
+        """Compare a fresh odds payload with the tracked lines.
+
+        Returns {game id: [move, ...]} for games whose lines moved past the
+        thresholds. A line's baseline only advances when it is reported as
+        moved, so slow drifts are reported once they add up. Lines seen for
+        the first time become the baseline and are not reported.
+        """
+        keys, current = _flatten(games)
+        if not keys:
+            self._lines = {}
+            return {}
+
+        previous = np.array([self._lines.get(k, (np.nan, np.nan)) for k in keys], dtype=float)
+        market_thresholds = np.array([self._threshold(k[2]) for k in keys], dtype=float)
+
+        # One vectorized pass over every line in the payload.
+        with np.errstate(invalid='ignore'):
+            delta = np.column_stack((
+                implied_probability(current[:, 0]) - implied_probability(previous[:, 0]),
+                current[:, 1] - previous[:, 1],
+            ))
+            moved = (np.abs(delta) >= market_thresholds).any(axis=1)
+        is_new = np.isnan(previous).all(axis=1)
+
+        moves = {}
+        for i in np.flatnonzero(moved):
+            game_id, bookmaker, market, outcome = keys[i]
+            moves.setdefault(game_id, []).append({
+                'bookmaker': bookmaker,
+                'market': market,
+                'outcome': outcome,
+                'old_price': previous[i, 0],
+                'new_price': current[i, 0],
+                'old_point': previous[i, 1],
+                'new_point': current[i, 1],
+            })
+
+        # Keep baselines for unchanged lines, advance moved ones, add new ones and
+        # drop lines that are no longer offered.
+        advance = moved | is_new
+        self._lines = {
+            k: (tuple(current[i]) if advance[i] else self._lines[k])
+            for i, k in enumerate(keys)
+        }
+        return moves
+
+    def _threshold(self, market):
+        """Thresholds for a market in the same [price, point] column order as the lines."""
+        threshold = self.thresholds.get(market, {'point': np.inf, 'prob': np.inf})
+        return (threshold['prob'], threshold['point'])
+
+    def __len__(self):
+        return len(self._lines)
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def implied_probability(prices):
+    """Implied win probability of American odds prices (vig included); NaN stays NaN."""
+    prices = np.asarray(prices, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(prices < 0, -prices / (100 - prices), 100 / (prices + 100))
+
+
+def _flatten(games):
+    """Flatten the-odds-api games into line keys and a (n, 2) array of [price, point]."""
+    keys = []
+    values = []
+    for game in games:
+        for bookmaker in game.get('bookmakers', []):
+            for market in bookmaker.get('markets', []):
+                for outcome in market.get('outcomes', []):
+                    keys.append((game.get('id'), bookmaker.get('title', bookmaker.get('key')),
+                                 market.get('key'), outcome.get('name')))
+                    values.append((outcome.get('price', np.nan), outcome.get('point', np.nan)))
+    return keys, np.array(values, dtype=float).reshape(-1, 2)
+
+
+def format_move(move):
+    """One line of text describing a single line move."""
+    def line(price, point):
+        point_text = "" if np.isnan(point) else f"{point:+g} "
+        return f"{point_text}({price:+g})"
+
+    return (
+        f"{move['bookmaker']} {move['market']}: {move['outcome']} "
+        f"{line(move['old_price'], move['old_point'])} → {line(move['new_price'], move['new_point'])}"
+    )
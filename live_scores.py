@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from discord.ext import tasks
+from changes import ChangeTracker, score_entities
+from http_client import fetch_json
+from leagues import LEAGUES, espn_url
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Poll intervals, driven by the state of the day's games
+LIVE_POLL_SECONDS = 10           # A game is in progress
+STARTING_POLL_SECONDS = 30       # A game is due to start within the next few minutes
+STARTING_WINDOW_SECONDS = 5 * 60
+IDLE_POLL_SECONDS = 60 * 60      # Nothing left to play today, or an off-day
+ERROR_POLL_SECONDS = 60
+
+# Current scoreboard per league: key -> {'events': [...], 'fetched_at': datetime}
+scoreboards = {}
+
+# Per-league game fingerprints, used to tell listeners which games changed
+_trackers = {}
+
+# Callables invoked as listener(key, games) with the games whose score or status changed
+listeners = []
+
+# Running scoreboard loop per league, so a second on_ready doesn't start duplicates
+_loops = {}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def get_events(key):
+    """Return the in-memory scoreboard events for a league, or None before the first poll."""
+    board = scoreboards.get(key)
+    return board['events'] if board else None
+
+
+def game_state(game):
+    """ESPN's coarse game state: 'pre', 'in' or 'post'."""
+    return game.get('status', {}).get('type', {}).get('state', 'pre')
+
+
+def start_time(game):
+    try:
+        return datetime.fromisoformat(game['date'].replace('Z', '+00:00'))
+    except (KeyError, ValueError, AttributeError):
+        return None
+
+
+def poll_delay(events, now=None):
+    """Seconds until the next scoreboard poll based on the games' states.
+
+    Poll every few seconds while any game is in progress, wake up for the next
+    tip-off or kickoff, and go idle when everything today is final or there are
+    no games at all.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    if any(game_state(game) == 'in' for game in events):
+        return LIVE_POLL_SECONDS
+
+    upcoming = [
+        start for start in (start_time(game) for game in events if game_state(game) == 'pre')
+        if start is not None
+    ]
+    if upcoming:
+        until_start = (min(upcoming) - now).total_seconds()
+        if until_start <= STARTING_WINDOW_SECONDS:
+            return STARTING_POLL_SECONDS  # About to start, or running late
+        # Wake up just before the next start, re-checking the schedule at least hourly.
+        return min(until_start - STARTING_WINDOW_SECONDS, IDLE_POLL_SECONDS)
+
+    return IDLE_POLL_SECONDS
+
+
+async def refresh_scoreboard(key):
+    """Fetch a league's scoreboard, store it and notify listeners of changed games."""
+    data = await fetch_json(espn_url(key, 'scoreboard'))
+    events = data.get('events', [])
+    scoreboards[key] = {'events': events, 'fetched_at': datetime.now(timezone.utc)}
+
+    tracker = _trackers.setdefault(key, ChangeTracker())
+    changed = tracker.update(score_entities(events))
+    if changed:
+        games = [game for game in events if game.get('id') in changed]
+        for listener in listeners:
+            try:
+                listener(key, games)
+            except Exception as e:
+                print(f"Error in live score listener: {e}")
+    return events
+
+
+def start_live_scores():
+    """Start one game-state-driven scoreboard loop per league."""
+    for key, league in LEAGUES.items():
+        _scores_loop(key, league)
+
+
+def _scores_loop(key, league):
+    if key in _loops:
+        return
+
+    @tasks.loop(seconds=LIVE_POLL_SECONDS)
+    async def update_scores():
+        try:
+            events = await refresh_scoreboard(key)
+            delay = poll_delay(events)
+        except Exception as e:
+            print(f"Error fetching {league['name']} scoreboard: {e}")
+            delay = ERROR_POLL_SECONDS
+
+        if delay != update_scores.seconds:
+            update_scores.change_interval(seconds=delay)
+
+    _loops[key] = update_scores
+    update_scores.start()
+    print(f"{league['name']} live scores loop has started.")
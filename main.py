@@ -1,15 +1,17 @@
 import discord
 from discord.ext import commands
-from nba import start_nba_updates, fetch_latest_nba_odds, fetch_latest_nba_news
-from nfl import start_nfl_updates, fetch_latest_nfl_odds, fetch_latest_nfl_news
+from feeds import publish_feeds, start_feed_updates, start_odds_updates
+from live_scores import start_live_scores
+from team_index import warm_team_indexes
+from model_registry import load_current
+from ml_service import ml_service, start_model_training
+from game_store import game_store
+from ratings import start_ratings
+from prediction_cache import start_prediction_updates
+from audio_backends import backend
 import asyncio
-from security import (
-    DISCORD_TOKEN,
-    DISCORD_CHANNEL_ID_NBA_NEWS,
-    DISCORD_CHANNEL_ID_NBA_ODDS,
-    DISCORD_CHANNEL_ID_NFL_NEWS,
-    DISCORD_CHANNEL_ID_NFL_ODDS,
-)
+from http_client import close_session
+from security import DISCORD_TOKEN
 
 # Intents setup for the bot
 intents = discord.Intents.default()
@@ -20,69 +22,51 @@ intents.guilds = True
 # Initialize the bot
 bot = commands.Bot(command_prefix="/", intents=intents)
 
+# on_ready fires again after every gateway reconnect; the startup below runs once
+started = False
+
 async def load_extensions():
     """Load all necessary extensions (Cogs)."""
     await bot.load_extension('commands')  # Ensure `commands.py` Cog is loaded
 
-# Send the latest NBA data to the specified channels
-async def send_latest_nba_data():
-    nba_odds_channel = bot.get_channel(DISCORD_CHANNEL_ID_NBA_ODDS)
-    nba_news_channel = bot.get_channel(DISCORD_CHANNEL_ID_NBA_NEWS)
-
-    odds_embed = await fetch_latest_nba_odds()
-    news_embed = await fetch_latest_nba_news()
-
-    # Send NBA odds
-    if isinstance(odds_embed, str):
-        odds_embed = discord.Embed(title="Error Fetching NBA Odds", description=odds_embed, color=discord.Color.red())
-    if nba_odds_channel:
-        await nba_odds_channel.send(embed=odds_embed)
-
-    # Send NBA news
-    if isinstance(news_embed, str):
-        news_embed = discord.Embed(title="Error Fetching NBA News", description=news_embed, color=discord.Color.red())
-    if nba_news_channel:
-        await nba_news_channel.send(embed=news_embed)
-
-# Send the latest NFL data to the specified channels
-async def send_latest_nfl_data():
-    nfl_odds_channel = bot.get_channel(DISCORD_CHANNEL_ID_NFL_ODDS)
-    nfl_news_channel = bot.get_channel(DISCORD_CHANNEL_ID_NFL_NEWS)
-
-    odds_embed = await fetch_latest_nfl_odds()
-    news_embed = await fetch_latest_nfl_news()
-
-    # Send NFL odds
-    if isinstance(odds_embed, str):
-        odds_embed = discord.Embed(title="Error Fetching NFL Odds", description=odds_embed, color=discord.Color.red())
-    if nfl_odds_channel:
-        await nfl_odds_channel.send(embed=odds_embed)
-
-    # Send NFL news
-    if isinstance(news_embed, str):
-        news_embed = discord.Embed(title="Error Fetching NFL News", description=news_embed, color=discord.Color.red())
-    if nfl_news_channel:
-        await nfl_news_channel.send(embed=news_embed)
-
 @bot.event
 async def on_ready():
     """Event handler for when the bot is ready."""
+    global started
     print(f'Logged in as {bot.user.name}')
+    if started:
+        return
+    started = True
+
+    # Ratings are replayed from the game store and then moved by completed live games, so
+    # their score listener has to be registered before the first scoreboard poll.
+    await start_ratings(game_store)
+
+    # Keep scoreboards and team indexes in memory so /scores, /search and autocomplete never wait
+    start_live_scores()
+    await warm_team_indexes()
 
     # Add a short delay to ensure the bot is fully initialized
     await asyncio.sleep(5)
 
-    # Send initial NBA and NFL data
-    await send_latest_nba_data()
-    await send_latest_nfl_data()
+    # Send initial data for every league
+    await publish_feeds(bot, ignore_cache=True)
 
-    print("Initial NBA and NFL data sent.")
+    print("Initial league data sent.")
 
-    # Start the periodic NBA and NFL updates
-    start_nba_updates(bot)
-    start_nfl_updates(bot)
+    # Start the periodic league updates
+    start_feed_updates(bot)
+    start_odds_updates(bot)
+    start_model_training()
+    start_prediction_updates()
 
-    print("NBA and NFL update loops started.")
+    print("League update loops started.")
+
+    # Connect the audio backend (Lavalink nodes when AUDIO_BACKEND=lavalink)
+    try:
+        await backend.start(bot)
+    except Exception as e:
+        print(f"Error starting the {backend.name} audio backend: {e}")
 
     # Sync application (slash) commands
     try:
@@ -94,8 +78,15 @@ async def on_ready():
 async def main():
     """Main function to start the bot."""
     async with bot:
+        load_current()  # Load the registered prediction model once, /predict only runs inference
+        ml_service.start()  # Warm ML worker processes before the first /predict
         await load_extensions()  # Load the commands Cog
-        await bot.start(DISCORD_TOKEN)  # Start the bot
+        try:
+            await bot.start(DISCORD_TOKEN)  # Start the bot
+        finally:
+            ml_service.shutdown()
+            await backend.close()
+            await close_session()  # Release pooled upstream connections
 
 if __name__ == '__main__':
     # Run the bot using asyncio's event loop
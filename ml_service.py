@@ -0,0 +1,203 @@
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import time, timezone
+from discord.ext import tasks
+import model_registry
+from game_store import game_store, update_store, backfill_seasons
+from http_client import close_session
+from ratings import refresh_ratings
+from predictions import FEATURES, get_games_by_date, predict_games, train_and_register
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # Leave a core for the event loop
+MAX_PENDING_JOBS = 32      # Jobs queued or running before new ones are turned away
+PREDICT_TIMEOUT = 30       # Seconds
+TRAIN_TIMEOUT = 15 * 60
+RETRAIN_AT = time(hour=10, tzinfo=timezone.utc)  # After the previous night's games are final
+
+# Scheduled loops by name, so a second on_ready doesn't start duplicates
+_loops = {}
+
+
+class MLServiceBusy(Exception):
+    """Raised when the job queue is full."""
+
+# ---------------------------------------------------------------------------
+# ------------------------------ Worker Process -----------------------------
+# ---------------------------------------------------------------------------
+
+# Model cached inside each worker process: (version, model, meta)
+_worker_model = (None, None, None)
+
+
+def _init_worker():
+    """Preload the current model when a worker starts so the first job is warm."""
+    global _worker_model
+    version = model_registry.current_version()
+    if version is not None:
+        try:
+            _worker_model = (version, *model_registry.load_model(version))
+        except Exception as e:
+            print(f"ML worker could not preload model {version}: {e}")
+
+
+def _model_for(version):
+    """Return the worker's model, reloading it if a newer version is being served."""
+    global _worker_model
+    if _worker_model[0] != version:
+        _worker_model = (version, *model_registry.load_model(version))
+    return _worker_model[1], _worker_model[2]
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _predict_job(version, games):
+    model, meta = _model_for(version)
+    return predict_games(model, meta, games, history=game_store.frame())
+
+
+def _train_job():
+    """Train on the whole game store, read memory-mapped inside the worker."""
+    return train_and_register(game_store.frame(), game_store.teams())
+
+# -------------------------------------------------------------------------
+# ------------------------------ ML Service -------------------------------
+# -------------------------------------------------------------------------
+
+class MLService:
+    """Runs CPU-heavy prediction and training jobs in a process pool off the event loop."""
+
+    def __init__(self, max_workers=MAX_WORKERS, max_pending=MAX_PENDING_JOBS):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = None
+        self._pending = 0
+        self._lock = threading.Lock()  # _pending is released from the pool's thread
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            for _ in range(self.max_workers):
+                self._pool.submit(_warm_up)  # Spawn every worker now instead of on the first /predict
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, func, *args, timeout=PREDICT_TIMEOUT):
+        """Run func(*args) in a worker and await the result.
+
+        Raises MLServiceBusy when the queue is full and asyncio.TimeoutError when
+        the job takes longer than `timeout`. A job still waiting in the queue is
+        cancelled if its caller is cancelled or times out. A job that has
+        already started can't be stopped, so it keeps its place in the queue
+        until its worker finishes it.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise MLServiceBusy(f"{self._pending} ML jobs are already queued.")
+            self._pending += 1
+
+        self.start()
+        try:
+            job = self._pool.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        job.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+
+    def _release(self, job=None):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self):
+        return {'workers': self.max_workers, 'pending': self._pending, 'max_pending': self.max_pending}
+
+
+# Shared service for the whole bot
+ml_service = MLService()
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+async def generate_predictions(day, games=None):
+    """Predictions for a day's games with the current registered model.
+
+    Returns a list of predictions, or a message when there is nothing to predict.
+    Pass `games` when the slate has already been fetched.
+    """
+    model, meta = model_registry.current_model()
+    if model is None:
+        return "No trained model is available yet."
+    if meta.get('features') != FEATURES:
+        return f"Model {meta.get('version')} was trained on different features. Please retrain."
+
+    games = games if games is not None else await get_games_by_date(day)
+
+    if games is None:
+        return f"Could not fetch the NBA schedule for {day}. Please try again later."
+    if not games:
+        return f"No NBA games on {day}."
+
+    return await ml_service.run(_predict_job, meta['version'], games)
+
+
+async def retrain():
+    """Append new games to the store, replay the ratings, train on it in a worker and start serving the new model."""
+    added = await update_store()
+    print(f"Added {added} games to the game store.")
+    await refresh_ratings(game_store)
+    version = await ml_service.run(_train_job, timeout=TRAIN_TIMEOUT)
+    model_registry.load_current()
+    return version
+
+
+def start_model_training():
+    """Retrain the prediction model once a day."""
+    if 'training' in _loops:
+        return
+
+    @tasks.loop(time=RETRAIN_AT)
+    async def retrain_model():
+        try:
+            version = await retrain()
+            print(f"Prediction model {version} trained and loaded.")
+        except Exception as e:
+            print(f"Error retraining prediction model: {e}")
+
+    _loops['training'] = retrain_model
+    retrain_model.start()
+    print("Model training loop has started.")
+
+
+async def _main(args):
+    try:
+        if args[0] == 'backfill':
+            added = await backfill_seasons([int(season) for season in args[1:]])
+            print(f"Added {added} games to the game store.")
+        elif args[0] == 'train':
+            version = await retrain()
+            print(f"Saved prediction model {version}.")
+    finally:
+        ml_service.shutdown()
+        await close_session()
+
+
+if __name__ == '__main__':
+    # Usage: python ml_service.py backfill <season> [<season> ...]
+    #        python ml_service.py train
+    if len(sys.argv) < 2 or sys.argv[1] not in ('backfill', 'train'):
+        print("Usage: python ml_service.py backfill <season> [<season> ...] | train")
+        sys.exit(1)
+    asyncio.run(_main(sys.argv[1:]))
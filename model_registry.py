@@ -0,0 +1,81 @@
+import json
+import os
+from datetime import datetime
+import joblib
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+MODELS_DIR = os.path.join('data', 'models')
+CURRENT_FILE = os.path.join(MODELS_DIR, 'CURRENT')  # Holds the version /predict serves
+
+# Model served by /predict, loaded once: (model, meta) or (None, None)
+_current = (None, None)
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def save_model(model, meta, make_current=True):
+    """Save a trained model with its metadata as a new version and return the version."""
+    version = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(MODELS_DIR, version)
+    os.makedirs(path, exist_ok=True)
+
+    joblib.dump(model, os.path.join(path, 'model.joblib'))
+    meta = {**meta, 'version': version, 'trained_at': datetime.now().isoformat(timespec='seconds')}
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    if make_current:
+        with open(CURRENT_FILE, 'w') as f:
+            f.write(version)
+    return version
+
+
+def list_versions():
+    """All saved versions, oldest first."""
+    if not os.path.isdir(MODELS_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(MODELS_DIR)
+        if os.path.isfile(os.path.join(MODELS_DIR, name, 'meta.json'))
+    )
+
+
+def current_version():
+    try:
+        with open(CURRENT_FILE) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_model(version):
+    """Load a saved model version and its metadata."""
+    path = os.path.join(MODELS_DIR, version)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    return joblib.load(os.path.join(path, 'model.joblib')), meta
+
+
+def load_current():
+    """(Re)load the current version into memory. Returns (model, meta) or (None, None)."""
+    global _current
+    version = current_version()
+    if version is None:
+        _current = (None, None)
+    else:
+        try:
+            _current = load_model(version)
+            print(f"Loaded prediction model {version}.")
+        except Exception as e:
+            print(f"Error loading prediction model {version}: {e}")
+            _current = (None, None)
+    return _current
+
+
+def current_model():
+    """The in-memory current model and its metadata, without touching the disk."""
+    return _current
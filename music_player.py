@@ -0,0 +1,291 @@
+import asyncio
+import random
+import time
+from collections import deque
+from itertools import islice
+import discord
+from audio_backends import backend
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+QUEUE_PAGE_SIZE = 10
+
+# --------------- Gapless playback
+PRERESOLVE_TRACKS = 2        # Queued tracks whose stream URLs are kept fresh ahead of time
+WARM_SOURCES = 1             # ...of which this many also get FFmpeg started before they're needed
+GAP_HISTORY = 100            # Track-to-track gaps kept per guild for gap_stats()
+FOOTER = "Strategic Investments & Sports Analysis"
+
+# One player per guild: guild id -> GuildPlayer
+players = {}
+
+# -------------------------------------------------------------------------
+# ------------------------------ Guild Player -----------------------------
+# -------------------------------------------------------------------------
+
+class GuildPlayer:
+    """A guild's queue, voice client and now-playing state.
+
+    Tracks are dicts from the audio backend. The queue is a deque, so taking
+    the next track and queueing one are O(1). Playlist entries are queued
+    unresolved and looked up by the prefetch below, a few at a time, so a
+    long playlist costs only a title and URL per waiting track.
+
+    While a track plays, the next PRERESOLVE_TRACKS queued tracks are
+    refreshed and the first WARM_SOURCES are opened by the backend, so the
+    next track starts the moment the current one ends.
+    """
+
+    def __init__(self, guild_id, loop):
+        self.guild_id = guild_id
+        self.loop = loop
+        self.queue = deque()
+        self.current = None
+        self.voice_client = None
+        self.text_channel = None  # Where "Now Playing" is announced
+        self._prepared = {}       # id(track) -> (task preparing it, warm); a warm task returns an opened source
+        self._starting = asyncio.Lock()  # Held while play_next opens a track, so two calls can't race
+        self._ended_at = None     # perf_counter() when the last track ended
+        self.gaps = deque(maxlen=GAP_HISTORY)  # Seconds of silence between consecutive tracks
+
+    # --------------- Queue
+    def add(self, track):
+        self.queue.append(track)
+        self._prefetch()
+        return len(self.queue)
+
+    def extend(self, tracks):
+        """Queue several tracks at once; returns the 1-based position of the first."""
+        position = len(self.queue) + 1
+        self.queue.extend(tracks)
+        self._prefetch()
+        return position
+
+    def remove(self, position):
+        """Remove and return the track at a 1-based queue position."""
+        index = self._index(position)
+        track = self.queue[index]
+        del self.queue[index]
+        self._prefetch()
+        return track
+
+    def move(self, position, new_position):
+        """Move a track to a new 1-based position and return it."""
+        track = self.remove(position)
+        self.queue.insert(min(max(new_position, 1), len(self.queue) + 1) - 1, track)
+        self._prefetch()
+        return track
+
+    def shuffle(self):
+        tracks = list(self.queue)  # Shuffling a deque in place indexes into its middle, which is O(n) per swap
+        random.shuffle(tracks)
+        self.queue = deque(tracks)
+        self._prefetch()
+
+    def clear(self):
+        self.queue.clear()
+        self._prefetch()
+
+    def page(self, page, per_page=QUEUE_PAGE_SIZE):
+        """((position, track) pairs on a 1-based page, page count). Out-of-range pages are clamped."""
+        pages = max(1, -(-len(self.queue) // per_page))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * per_page
+        tracks = [(start + i + 1, self.queue[start + i]) for i in range(min(per_page, len(self.queue) - start))]
+        return tracks, page, pages
+
+    def _index(self, position):
+        if not 1 <= position <= len(self.queue):
+            raise IndexError(f"There is no track at position {position}.")
+        return position - 1
+
+    # --------------- Playback
+    def is_playing(self):
+        return bool(self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()))
+
+    @property
+    def starting(self):
+        """True while play_next is opening a track; is_playing() is still False then."""
+        return self._starting.locked()
+
+    async def play_next(self):
+        """Start the next queued track, skipping ones that fail to open.
+
+        Calls are serialized: one that waited for another returns without
+        doing anything if the other started a track.
+        """
+        async with self._starting:
+            if self.is_playing():
+                return None
+            return await self._start_next()
+
+    async def _start_next(self):
+        while self.queue:
+            track = self.queue.popleft()
+            try:
+                source = await self._take_source(track)
+            except Exception as e:
+                await self._announce(content=f"Error playing {track['title']}: {e}")
+                continue
+            try:
+                self.voice_client.play(source, after=self._after)
+            except discord.ClientException as e:
+                # Already playing or disconnected: not the track's fault, so it stays first in line
+                print(f"Could not start {track['title']} in guild {self.guild_id}: {e}")
+                source.cleanup()
+                self.queue.appendleft(track)
+                self._prefetch()
+                return None
+            except Exception as e:
+                source.cleanup()
+                await self._announce(content=f"Error playing {track['title']}: {e}")
+                continue
+
+            self._record_gap(track)
+            self.current = track
+            self._prefetch()
+            embed = discord.Embed(title="Now Playing", description=f"**{track['title']}**", color=discord.Color.red())
+            embed.set_footer(text=FOOTER)
+            await self._announce(embed=embed)
+            return track
+
+        self.current = None
+        self._ended_at = None
+        await self._announce(content="The queue is empty.")
+        return None
+
+    def _after(self, error):
+        # Called by discord.py's audio thread when a track ends
+        self._ended_at = time.perf_counter()
+        if error:
+            print(f"Player error in guild {self.guild_id}: {error}")
+        if self.voice_client and self.voice_client.is_connected():
+            asyncio.run_coroutine_threadsafe(self.play_next(), self.loop)
+
+    # --------------- Prefetching
+    def _prefetch(self):
+        """Prepare the tracks at the front of the queue and drop work for ones that left it."""
+        upcoming = {id(track): (i, track) for i, track in enumerate(islice(self.queue, PRERESOLVE_TRACKS))}
+
+        for key in list(self._prepared):
+            if key not in upcoming:
+                _discard(self._prepared.pop(key)[0])
+
+        for key, (i, track) in upcoming.items():
+            warm = i < WARM_SOURCES
+            if key in self._prepared:
+                if self._prepared[key][1] >= warm:
+                    continue
+                _discard(self._prepared.pop(key)[0])  # Moved up the queue; start again with a warm source
+            self._prepared[key] = (self.loop.create_task(self._prepare(track, warm)), warm)
+
+    async def _prepare(self, track, warm):
+        await backend.refresh(track, self.guild_id)
+        if warm:
+            return await backend.open(track, self.guild_id)
+        return track
+
+    async def _take_source(self, track):
+        """An opened source for a track: the prefetched one if it's ready, else opened now."""
+        task, _ = self._prepared.pop(id(track), (None, False))
+        if task is not None:
+            try:
+                source = await task
+                if isinstance(source, discord.AudioSource):
+                    return source
+            except Exception as e:
+                print(f"Prefetch failed for {track['title']}: {e}")
+
+        return await backend.open(track, self.guild_id)
+
+    # --------------- Gap measurement
+    def _record_gap(self, track):
+        if self._ended_at is None:
+            return  # First track after an idle queue; there was no previous track
+        gap = time.perf_counter() - self._ended_at
+        self._ended_at = None
+        self.gaps.append(gap)
+        print(f"Guild {self.guild_id}: {gap * 1000:.0f} ms gap before {track['title']}")
+
+    def gap_stats(self):
+        """Count, mean and max of recent track-to-track gaps, in milliseconds."""
+        if not self.gaps:
+            return {'count': 0, 'mean_ms': None, 'max_ms': None}
+        return {
+            'count': len(self.gaps),
+            'mean_ms': sum(self.gaps) / len(self.gaps) * 1000,
+            'max_ms': max(self.gaps) * 1000,
+        }
+
+    def skip(self):
+        if self.voice_client and self.is_playing():
+            self.voice_client.stop()  # The after-callback starts the next track
+            return True
+        return False
+
+    def pause(self):
+        if self.voice_client and self.voice_client.is_playing():
+            self.voice_client.pause()
+            return True
+        return False
+
+    def resume(self):
+        if self.voice_client and self.voice_client.is_paused():
+            self.voice_client.resume()
+            return True
+        return False
+
+    def stop(self):
+        """Stop playback and clear the queue."""
+        self.clear()
+        self.current = None
+        if self.voice_client and self.is_playing():
+            self.voice_client.stop()
+            return True
+        return False
+
+    async def disconnect(self):
+        self.clear()
+        self.current = None
+        self._ended_at = None
+        voice_client, self.voice_client = self.voice_client, None
+        if voice_client:
+            await voice_client.disconnect()
+
+    async def _announce(self, **kwargs):
+        if self.text_channel:
+            try:
+                await self.text_channel.send(**kwargs)
+            except discord.HTTPException as e:
+                print(f"Could not announce in guild {self.guild_id}: {e}")
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _discard(task):
+    """Cancel a prefetch task, closing the FFmpeg process it may already have started."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        result = task.result()
+        if isinstance(result, discord.AudioSource):
+            result.cleanup()
+
+
+def get_player(guild):
+    """The guild's player, created on first use."""
+    player = players.get(guild.id)
+    if player is None:
+        player = players[guild.id] = GuildPlayer(guild.id, asyncio.get_running_loop())
+    player.voice_client = guild.voice_client
+    return player
+
+
+async def remove_player(guild_id):
+    """Disconnect and forget a guild's player."""
+    player = players.pop(guild_id, None)
+    if player:
+        await player.disconnect()
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Poll interval bounds for the-odds-api
+MIN_POLL_SECONDS = 2 * 60
+MAX_POLL_SECONDS = 6 * 60 * 60   # Same as the old fixed loop, used when nothing is scheduled
+RESERVE_CREDITS = 25             # Never spend the last few credits on scheduled polls
+
+# --------------- Game proximity windows
+HOT_BEFORE = timedelta(hours=1)  # Lines move most in the hour before tip-off / kickoff
+HOT_AFTER = timedelta(hours=4)   # ...and while the game is being played
+SOON = timedelta(hours=24)
+
+HOT_FACTOR = 0.25   # Poll 4x as often as the even spread near game time
+COLD_FACTOR = 4.0   # ...and 4x less often when no game starts within a day
+
+# -------------------------------------------------------------------------
+# ------------------------------ Odds Quota -------------------------------
+# -------------------------------------------------------------------------
+
+class OddsQuota:
+    """Credit budget reported by the-odds-api, plus local burn accounting."""
+
+    def __init__(self):
+        self.remaining = None  # Unknown until the first response
+        self.used = None
+        self.burn = defaultdict(float)  # (league key, market) -> credits spent
+
+    def record(self, key, markets, headers):
+        """Update the budget from a response's x-requests-* headers."""
+        if 'x-requests-remaining' in headers:
+            self.remaining = float(headers['x-requests-remaining'])
+        if 'x-requests-used' in headers:
+            self.used = float(headers['x-requests-used'])
+
+        # Cost is markets x regions; attribute it evenly to the markets requested.
+        cost = float(headers.get('x-requests-last', len(markets)))
+        for market in markets:
+            self.burn[(key, market)] += cost / len(markets)
+
+    def stats(self):
+        return {
+            'remaining': self.remaining,
+            'used': self.used,
+            'burn': dict(self.burn),
+        }
+
+
+# Shared quota for every league, since they draw on the same API key
+quota = OddsQuota()
+
+# Most recent odds payload per league: key -> {'data': [...], 'fetched_at': datetime}
+snapshots = {}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def seconds_until_reset(now):
+    """Seconds until the monthly quota resets (start of next month, UTC)."""
+    next_month = (now.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return max((next_month - now).total_seconds(), MIN_POLL_SECONDS)
+
+
+def commence_times(games):
+    """Parse the commence_time of every game in an odds payload."""
+    times = []
+    for game in games:
+        try:
+            times.append(datetime.fromisoformat(game['commence_time'].replace('Z', '+00:00')))
+        except (KeyError, ValueError, AttributeError):
+            continue
+    return times
+
+
+def next_poll_delay(key, markets, leagues=1, now=None):
+    """Seconds to wait before polling a league's odds again.
+
+    The remaining credits are spread evenly across the leagues and the time left
+    until the quota resets, then scaled up near game time and down when nothing
+    is scheduled. The delay is recomputed from the live quota after every poll,
+    so overspending in busy stretches is paid back automatically later.
+    """
+    now = now or datetime.now(timezone.utc)
+    if quota.remaining is None:
+        return MIN_POLL_SECONDS  # No quota information yet, learn it on the next poll
+
+    cost = len(markets)
+    polls_left = (quota.remaining - RESERVE_CREDITS) / cost / leagues
+    if polls_left < 1:
+        return MAX_POLL_SECONDS
+
+    delay = seconds_until_reset(now) / polls_left
+
+    snapshot = snapshots.get(key)
+    starts = commence_times(snapshot['data']) if snapshot else []
+    if any(start - HOT_BEFORE <= now <= start + HOT_AFTER for start in starts):
+        delay *= HOT_FACTOR
+    elif not any(now <= start <= now + SOON for start in starts):
+        delay *= COLD_FACTOR
+
+    return min(max(delay, MIN_POLL_SECONDS), MAX_POLL_SECONDS)
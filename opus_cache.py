@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import os
+import resource
+import sys
+import time
+from collections import OrderedDict
+import discord
+from discord.oggparse import OggStream
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+OPUS_CACHE_DIR = os.path.join('data', 'opus_cache')
+OPUS_CACHE_BYTES = int(os.getenv('OPUS_CACHE_MB', '2048')) * 1024 * 1024  # LRU size budget on disk
+
+CACHE_AFTER_PLAYS = 2        # A track is encoded to disk once it has been played this often
+MAX_PLAY_COUNTS = 4096       # Tracks whose play counts are remembered
+MAX_ENCODES = 1              # Background encodes running at once
+MAX_TRACK_SECONDS = 20 * 60  # Longer tracks (mixes, streams) are never cached
+ENCODE_TIMEOUT = 10 * 60     # Seconds
+
+# Same output as discord.FFmpegOpusAudio, so cached files play exactly like live streams
+FFMPEG_BEFORE_ARGS = ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5']
+FFMPEG_ENCODE_ARGS = [
+    '-vn', '-map_metadata', '-1', '-c:a', 'libopus', '-ar', '48000', '-ac', '2',
+    '-b:a', '128k', '-application', 'lowdelay', '-f', 'opus',
+]
+OPUS_HEADERS = (b'OpusHead', b'OpusTags')  # Ogg header packets, which aren't audio
+
+# -------------------------------------------------------------------------
+# ------------------------------ Opus Cache -------------------------------
+# -------------------------------------------------------------------------
+
+class OpusFileSource(discord.AudioSource):
+    """Plays a cached Ogg/Opus file by handing its packets straight to the voice client.
+
+    No FFmpeg process and no re-encode: reading a packet is a small file read.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._packets = OggStream(self._file).iter_packets()
+
+    def read(self):
+        for packet in self._packets:
+            if not packet.startswith(OPUS_HEADERS):
+                return packet
+        return b''
+
+    def is_opus(self):
+        return True
+
+    def cleanup(self):
+        self._file.close()
+
+
+class OpusCache:
+    """Content-addressed disk cache of encoded tracks, keyed by the track's video id.
+
+    Tracks played CACHE_AFTER_PLAYS times are encoded once in the background;
+    later plays read the file with OpusFileSource instead of streaming and
+    encoding again. Files are evicted least recently played first once the
+    cache is over `max_bytes`. File modification times record the last play,
+    so the LRU order survives restarts.
+    """
+
+    def __init__(self, directory=OPUS_CACHE_DIR, max_bytes=OPUS_CACHE_BYTES, cache_after=CACHE_AFTER_PLAYS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.cache_after = cache_after
+        self._files = OrderedDict()  # key -> size in bytes, least recently played first
+        self._plays = OrderedDict()  # key -> plays not served from the cache
+        self._encoding = {}          # key -> encode task
+        self._slots = None           # Encode semaphore, created on the running loop
+        self._loaded = False
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.encoded = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(track):
+        video_id = track.get('id')
+        return hashlib.sha256(video_id.encode()).hexdigest() if video_id else None
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.opus')
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        found = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                if name.endswith('.part'):
+                    os.remove(path)  # Left by an encode that was interrupted
+                elif name.endswith('.opus'):
+                    stat = os.stat(path)
+                    found.append((stat.st_mtime, name[:-len('.opus')], stat.st_size))
+        for _, key, size in sorted(found):
+            self._files[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def __contains__(self, track):
+        self._load()
+        key = self.key(track)
+        return key is not None and key in self._files
+
+    def open(self, track):
+        """An OpusFileSource for a cached track, or None on a miss."""
+        if track not in self:
+            return None
+        key = self.key(track)
+        path = self.path(key)
+        try:
+            source = OpusFileSource(path)
+            os.utime(path)
+        except OSError as e:
+            print(f"Could not open cached track {path}: {e}")
+            self.total_bytes -= self._files.pop(key)
+            return None
+        self._files.move_to_end(key)
+        self.hits += 1
+        return source
+
+    def played(self, track):
+        """Count a play that was streamed, and encode the track in the background once it's popular."""
+        key = self.key(track)
+        if key is None:
+            return
+        self.misses += 1
+        plays = self._plays.pop(key, 0) + 1
+        self._plays[key] = plays
+        while len(self._plays) > MAX_PLAY_COUNTS:
+            self._plays.popitem(last=False)
+
+        # Unknown durations are usually live streams, whose encode would never finish
+        duration = track.get('duration')
+        cacheable = duration is not None and duration <= MAX_TRACK_SECONDS and not track.get('is_live')
+        if plays >= self.cache_after and key not in self._encoding and cacheable and track.get('url'):
+            task = asyncio.get_running_loop().create_task(self._encode(key, track['url']))
+            self._encoding[key] = task
+            task.add_done_callback(lambda _: self._encoding.pop(key, None))
+
+    async def _encode(self, key, url):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(MAX_ENCODES)
+        path = self.path(key)
+        part = f'{path}.part'
+        async with self._slots:
+            if key in self._files:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            before = FFMPEG_BEFORE_ARGS if url.startswith(('http://', 'https://')) else []
+            started = time.perf_counter()
+            process = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    'ffmpeg', '-y', '-loglevel', 'error', *before, '-i', url, *FFMPEG_ENCODE_ARGS, part,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                _, stderr = await asyncio.wait_for(process.communicate(), ENCODE_TIMEOUT)
+                if process.returncode != 0:
+                    raise RuntimeError(stderr.decode(errors='replace').strip() or f"ffmpeg exited with {process.returncode}")
+                os.replace(part, path)
+            except BaseException as e:
+                if process is not None and process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                if os.path.exists(part):
+                    os.remove(part)
+                if not isinstance(e, Exception):
+                    raise  # Cancelled by close()
+                print(f"Could not cache track {key[:12]}: {e}")
+                self._plays.pop(key, None)  # Start counting again rather than retrying on every play
+                return
+
+        size = os.path.getsize(path)
+        self._files[key] = size
+        self.total_bytes += size
+        self._plays.pop(key, None)
+        self.encoded += 1
+        print(f"Cached track {key[:12]} ({size / 1024 / 1024:.1f} MB) in {time.perf_counter() - started:.1f}s")
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._files:
+            key, size = self._files.popitem(last=False)  # Least recently played
+            self.total_bytes -= size
+            self.evicted += 1
+            try:
+                os.remove(self.path(key))
+            except OSError as e:
+                print(f"Could not evict cached track {key[:12]}: {e}")
+
+    async def close(self):
+        """Stop any background encodes; their partial files are removed."""
+        tasks = list(self._encoding.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        plays = self.hits + self.misses
+        return {
+            'files': len(self._files),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / plays if plays else 0.0,
+            'encoding': len(self._encoding),
+            'encoded': self.encoded,
+            'evicted': self.evicted,
+        }
+
+
+# Shared cache for the FFmpeg audio backend
+opus_cache = OpusCache()
+
+# -------------------------------------------------------------------------
+# ------------------------------ Benchmark --------------------------------
+# -------------------------------------------------------------------------
+
+def _cpu_seconds():
+    """CPU time used by this process and its finished child processes (FFmpeg)."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _measure(sources, seconds):
+    """Read `seconds` of audio from every source in turn, as the voice clients would, and
+    return CPU seconds per second of audio per stream."""
+    started = _cpu_seconds()
+    for _ in range(seconds * 50):  # 20 ms packets
+        for source in sources:
+            source.read()
+    for source in sources:
+        source.cleanup()  # Reaps the FFmpeg processes, so their CPU time is counted
+    return (_cpu_seconds() - started) / (len(sources) * seconds)
+
+
+async def _benchmark(source, streams=4, seconds=30):
+    """CPU per concurrent stream for cache misses (FFmpeg transcoding, as streamed tracks
+    play) versus cache hits (OpusFileSource reading a cached file)."""
+    misses = [discord.FFmpegOpusAudio(source, bitrate=128, options='-vn -application lowdelay') for _ in range(streams)]
+    miss_cpu = _measure(misses, seconds)
+
+    cache = OpusCache(directory=os.path.join('data', 'opus_benchmark'), cache_after=1)
+    track = {'id': f'benchmark:{source}', 'url': source}
+    await cache._encode(cache.key(track), source)
+    if track not in cache:
+        print("Could not encode the source; is ffmpeg installed?")
+        return
+    hits = [cache.open(track) for _ in range(streams)]
+    hit_cpu = _measure(hits, seconds)
+
+    print(f"{streams} concurrent streams, {seconds}s of audio each:")
+    print(f"  miss (FFmpeg libopus encode): {miss_cpu * 100:.2f}% of a core per stream")
+    print(f"  hit  (cached Opus file):      {hit_cpu * 100:.2f}% of a core per stream")
+    if hit_cpu:
+        print(f"  hits use {miss_cpu / hit_cpu:.0f}x less CPU")
+
+
+if __name__ == '__main__':
+    # Usage: python opus_cache.py <audio file or stream URL> [streams] [seconds]
+    if len(sys.argv) < 2:
+        print("Usage: python opus_cache.py <audio file or stream URL> [streams] [seconds]")
+        sys.exit(1)
+    asyncio.run(_benchmark(
+        sys.argv[1],
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 30,
+    ))
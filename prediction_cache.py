@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+import numpy as np
+from discord.ext import tasks
+from changes import fingerprint
+from game_store import game_store
+from ml_service import generate_predictions
+from model_registry import current_version
+from predictions import get_games_by_date
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+PREDICTIONS_DIR = os.path.join('data', 'predictions')  # One <YYYY-MM-DD>.json slate per day
+REFRESH_MINUTES = 30  # How often today's schedule is checked for changes
+
+# Games in these states keep the pick they had before tip-off when a slate is recomputed
+LOCKED_STATUSES = ('InProgress', 'Final', 'F/OT')
+
+# Slates read or written this run: date -> slate
+_slates = {}
+
+# Scheduled loops by name, so a second on_ready doesn't start duplicates
+_loops = {}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def slate_fingerprint(games):
+    """Digest of what a slate's predictions depend on: which games, when, and their status."""
+    return fingerprint(sorted(
+        (game.get('GameID'), game.get('HomeTeam'), game.get('AwayTeam'), game.get('DateTime'), game.get('Status'))
+        for game in games
+    )).hex()
+
+
+def _path(day):
+    return os.path.join(PREDICTIONS_DIR, f'{day}.json')
+
+
+def load_slate(day):
+    """The cached slate for a day, or None. Reads the disk at most once per day."""
+    if day not in _slates:
+        try:
+            with open(_path(day)) as f:
+                _slates[day] = json.load(f)
+        except FileNotFoundError:
+            return None
+    return _slates[day]
+
+
+def _save_slate(slate):
+    os.makedirs(PREDICTIONS_DIR, exist_ok=True)
+    tmp = _path(slate['date']) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(slate, f, indent=2)
+    os.replace(tmp, _path(slate['date']))
+    _slates[slate['date']] = slate
+
+
+async def refresh_slate(day):
+    """Fetch a day's schedule and recompute its predictions only if the games changed.
+
+    Returns the slate, or a message when no predictions can be made. A failed
+    schedule fetch, or one that suddenly lists no games, never replaces picks
+    that were already made.
+    """
+    games = await get_games_by_date(day)
+    cached = load_slate(day)
+    if games is None:
+        return cached or f"Could not fetch the NBA schedule for {day}. Please try again later."
+    if not games and cached and cached['predictions']:
+        return cached
+
+    digest = slate_fingerprint(games)
+    if cached and cached['fingerprint'] == digest:
+        return cached
+
+    predictions = await generate_predictions(day, games) if games else []
+    if isinstance(predictions, str):
+        return predictions
+
+    # Games that have started keep their original pick so the record reflects what was posted.
+    if cached:
+        locked = {
+            game['GameID'] for game in games if game.get('Status') in LOCKED_STATUSES
+        }
+        previous = {pick['GameID']: pick for pick in cached['predictions'] if pick.get('GameID') in locked}
+        predictions = [previous.get(pick['GameID'], pick) for pick in predictions]
+
+    slate = {
+        'date': day,
+        'fingerprint': digest,
+        'model_version': current_version(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'predictions': predictions,
+    }
+    await asyncio.to_thread(_save_slate, slate)
+    return slate
+
+
+async def get_slate(day=None):
+    """The predictions for a day, from the cache whenever possible.
+
+    Today and future days are computed the first time they're asked for and
+    then kept current by the scheduled refresh. Past days are only ever read:
+    a pick made after the games were played isn't a pick.
+    """
+    day = day or today()
+    cached = await asyncio.to_thread(load_slate, day)
+    if cached:
+        return cached
+    if day < today():
+        return f"No predictions were made for {day}."
+    return await refresh_slate(day)
+
+
+def grade(slate, columns=None):
+    """Add a 'Result' ('W', 'L' or None while pending) to each pick from the game store."""
+    columns = columns if columns is not None else game_store.columns()
+    ids = np.array([pick.get('GameID') or -1 for pick in slate['predictions']], dtype=np.int64)
+    found = np.isin(columns['game_id'], ids)
+    finals = {
+        int(game_id): (home > away)
+        for game_id, home, away in zip(columns['game_id'][found], columns['home_score'][found], columns['away_score'][found])
+    }
+
+    graded = []
+    for pick in slate['predictions']:
+        home_won = finals.get(pick.get('GameID'))
+        if home_won is None:
+            result = None
+        else:
+            result = 'W' if (pick['MoneylinePrediction'] == pick['HomeTeam']) == home_won else 'L'
+        graded.append({**pick, 'Result': result})
+    return graded
+
+
+def pick_record():
+    """(wins, losses) over every cached past slate. Blocking; run it in a thread."""
+    if not os.path.isdir(PREDICTIONS_DIR):
+        return 0, 0
+    days = sorted(name[:-len('.json')] for name in os.listdir(PREDICTIONS_DIR) if name.endswith('.json'))
+
+    columns = game_store.columns()
+    wins = losses = 0
+    for day in days:
+        slate = load_slate(day)
+        if day >= today() or not slate:
+            continue
+        results = [pick['Result'] for pick in grade(slate, columns)]
+        wins += results.count('W')
+        losses += results.count('L')
+    return wins, losses
+
+
+def start_prediction_updates():
+    """Keep today's slate in step with the published schedule."""
+    if 'predictions' in _loops:
+        return
+
+    @tasks.loop(minutes=REFRESH_MINUTES)
+    async def update_predictions():
+        try:
+            result = await refresh_slate(today())
+            if isinstance(result, str):
+                print(f"Predictions not updated: {result}")
+        except Exception as e:
+            print(f"Error updating today's predictions: {e}")
+
+    _loops['predictions'] = update_predictions
+    update_predictions.start()
+    print("Prediction slate loop has started.")
@@ -1,33 +1,41 @@
-import requests
+import aiohttp
+import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from xgboost import XGBClassifier
 from sklearn.metrics import accuracy_score
 from security import SPORTS_DATA_API_KEY
+from http_client import fetch_json
+from model_registry import save_model
+from features import FORM_FEATURES, add_team_form
+from ratings import RATING_FEATURES, add_ratings
 
 API_KEY = SPORTS_DATA_API_KEY
 BASE_URL = 'https://api.sportsdata.io/v3/nba'
 
-def fetch_data(endpoint):
+FEATURES = ['HomeTeamCode', 'AwayTeamCode'] + FORM_FEATURES + RATING_FEATURES
+TARGET = 'Outcome'
+FINAL_STATUSES = ('Final', 'F/OT')
+
+MIN_TRAINING_ROWS = 20
+
+async def fetch_data(endpoint):
     """Helper function to make API requests and return JSON data."""
     try:
-        url = f"{BASE_URL}{endpoint}?key={API_KEY}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
+        url = f"{BASE_URL}{endpoint}"
+        return await fetch_json(url, params={"key": API_KEY})
+    except aiohttp.ClientResponseError as e:
         print(f"HTTP error: {e}")
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error: {e}")
     return None
 
-def get_games_by_date(date):
-    """Fetch NBA games for a specific date."""
-    data = fetch_data(f'/scores/json/GamesByDate/{date}')
-    return data if data else []
+async def get_games_by_date(date):
+    """Fetch NBA games for a specific date: a list (empty on an off-day), or None if the request failed."""
+    data = await fetch_data(f'/scores/json/GamesByDate/{date}')
+    return data if data is None else data or []
 
 def get_game_scores(games):
     """Fetch scores for games and return DataFrame with outcomes."""
@@ -42,8 +50,11 @@ def get_game_scores(games):
     df['HomeTeamScore'] = df['HomeTeamScore'].fillna(0).astype(float)
     df['AwayTeamScore'] = df['AwayTeamScore'].fillna(0).astype(float)
     df['Outcome'] = np.where(df['HomeTeamScore'] > df['AwayTeamScore'], 1, 0)
+    for column in ('GameID', 'Status'):
+        if column not in df.columns:
+            df[column] = None
 
-    return df[['HomeTeam', 'AwayTeam', 'DateTime', 'HomeTeamScore', 'AwayTeamScore', 'Outcome']]
+    return df[['GameID', 'HomeTeam', 'AwayTeam', 'DateTime', 'Status', 'HomeTeamScore', 'AwayTeamScore', 'Outcome']]
 
 def process_game_data(games):
     """Process game data into a DataFrame for analysis."""
@@ -52,67 +63,108 @@ def process_game_data(games):
         df['DateTime'] = pd.to_datetime(df['DateTime'])
     return df
 
-def prepare_features(df):
-    """Prepare features for machine learning model."""
-    df['HomeTeam'] = df['HomeTeam'].astype('category')
-    df['AwayTeam'] = df['AwayTeam'].astype('category')
-    df['HomeTeamCode'] = df['HomeTeam'].cat.codes
-    df['AwayTeamCode'] = df['AwayTeam'].cat.codes
-
-    # Replace the placeholder features with actual stats for more meaningful analysis.
-    df['Feature1'] = np.random.rand(len(df))
-    df['Feature2'] = np.random.rand(len(df))
-    return df
-
-def train_model(df):
-    """Train a machine learning model to predict game outcomes."""
-    features = ['HomeTeamCode', 'AwayTeamCode', 'Feature1', 'Feature2']
-    target = 'Outcome'
-
-    X_train, X_test, y_train, y_test = train_test_split(df[features], df[target], test_size=0.2, random_state=42)
-
-    model_rf = RandomForestClassifier(random_state=42)
+def prepare_features(df, teams=None, history=None):
+    """Prepare features for machine learning model.
+
+    `teams` is the team vocabulary saved with a trained model, so codes at
+    prediction time match the ones the model was trained on. `history` is the
+    completed games to compute rolling team form and Elo ratings from when
+    `df` is a slate of upcoming games; without it, they come from the games in
+    `df` itself.
+    """
+    teams = teams if teams is not None else sorted(set(df['HomeTeam']) | set(df['AwayTeam']))
+    for frame in (df,) if history is None else (df, history):
+        frame['HomeTeam'] = pd.Categorical(frame['HomeTeam'], categories=teams)
+        frame['AwayTeam'] = pd.Categorical(frame['AwayTeam'], categories=teams)
+        frame['HomeTeamCode'] = frame['HomeTeam'].cat.codes
+        frame['AwayTeamCode'] = frame['AwayTeam'].cat.codes
+
+    df = add_team_form(df, history)
+    return add_ratings(df, history)
+
+def train_model(df, seed=42):
+    """Train a machine learning model to predict game outcomes.
+
+    Returns the better of the two models and its evaluation metrics. The same
+    `seed` always gives the same split and the same models.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(df[FEATURES], df[TARGET], test_size=0.2, random_state=seed)
+
+    model_rf = RandomForestClassifier(random_state=seed)
     model_rf.fit(X_train, y_train)
 
-    model_xgb = XGBClassifier(random_state=42)
+    model_xgb = XGBClassifier(random_state=seed)
     model_xgb.fit(X_train, y_train)
 
     rf_accuracy = accuracy_score(y_test, model_rf.predict(X_test))
     xgb_accuracy = accuracy_score(y_test, model_xgb.predict(X_test))
 
-    return model_rf if rf_accuracy > xgb_accuracy else model_xgb
+    metrics = {
+        'rf_accuracy': float(rf_accuracy),
+        'xgb_accuracy': float(xgb_accuracy),
+        'model': 'RandomForest' if rf_accuracy > xgb_accuracy else 'XGBoost',
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+    }
+    return (model_rf if rf_accuracy > xgb_accuracy else model_xgb), metrics
 
 def predict_outcome(model, df):
     """Predict outcomes for upcoming games."""
-    features = ['HomeTeamCode', 'AwayTeamCode', 'Feature1', 'Feature2']
-    df['PredictedOutcome'] = model.predict(df[features])
+    df['PredictedOutcome'] = model.predict(df[FEATURES])
 
     # Simulate Moneyline and Point Spread predictions
     df['MoneylinePrediction'] = np.where(df['PredictedOutcome'] == 1, df['HomeTeam'], df['AwayTeam'])
     df['PointSpread'] = np.random.uniform(2, 12, size=len(df))  # Placeholder for point spread values
 
-    return df[['HomeTeam', 'AwayTeam', 'PredictedOutcome', 'MoneylinePrediction', 'PointSpread']]
-
-def generate_predictions_for_today():
-    """Generate predictions for today's games."""
-    today = datetime.now().strftime('%Y-%m-%d')
-    games = get_games_by_date(today)
+    return df[['GameID', 'HomeTeam', 'AwayTeam', 'PredictedOutcome', 'MoneylinePrediction', 'PointSpread']]
 
-    if not games:
-        return {"nba": "No NBA games today."}
+def predict_games(model, meta, games, history=None):
+    """Run a registered model over a slate of games. CPU-bound, runs in an ML worker.
 
+    `history` is the completed games (the game store's frame()) that team form
+    is computed from.
+    """
     game_df = process_game_data(games)
-    game_df = prepare_features(game_df)
-    model = train_model(game_df)
+    if game_df.empty:
+        return "No NBA games today."
+
+    game_df = prepare_features(game_df, teams=meta['teams'], history=history)
     predictions_df = predict_outcome(model, game_df)
 
     predictions = []
     for _, row in predictions_df.iterrows():
         predictions.append({
+            'GameID': None if pd.isna(row['GameID']) else int(row['GameID']),
             'HomeTeam': row['HomeTeam'],
             'AwayTeam': row['AwayTeam'],
             'MoneylinePrediction': row['MoneylinePrediction'],
             'PointSpread': round(row['PointSpread'], 2)
         })
 
-    return {"nba": predictions}
+    return predictions
+
+
+# -------------------------------------------------------------------------------
+# ------------------------------ Training Pipeline ------------------------------
+# -------------------------------------------------------------------------------
+
+def train_and_register(df, teams):
+    """Fit models on completed games and save the winner as the current version.
+
+    `df` has the columns of process_game_data() (the game store's frame()
+    does), and `teams` is the stable team vocabulary to encode with.
+    CPU-bound; callers on the event loop should run it in a worker.
+    """
+    if len(df) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Only {len(df)} completed games to train on, need {MIN_TRAINING_ROWS}.")
+
+    df = prepare_features(df.copy(), teams=teams)
+    model, metrics = train_model(df)
+
+    return save_model(model, {
+        'features': FEATURES,
+        'teams': list(teams),
+        'metrics': metrics,
+        'first_game': str(df['DateTime'].min()),
+        'last_game': str(df['DateTime'].max()),
+    })
@@ -0,0 +1,251 @@
+import asyncio
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+from live_scores import listeners, start_time
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+BASE_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 100.0   # Rating points added to the home team when predicting
+SEASON_CARRYOVER = 0.75  # Share of a team's distance from the mean kept into a new season
+
+# Columns added to a game frame by add_ratings()
+RATING_FEATURES = ['HomeElo', 'AwayElo', 'EloWinProb']
+
+# ESPN abbreviations that differ from the sportsdata.io keys the game store uses
+ESPN_ABBREVIATIONS = {'PHX': 'PHO', 'UTAH': 'UTA', 'WSH': 'WAS'}
+GAME_DAY_TIMEZONE = ZoneInfo('America/New_York')  # The game store dates games by their US calendar day
+
+# -------------------------------------------------------------------------
+# ------------------------------ Elo Ratings ------------------------------
+# -------------------------------------------------------------------------
+
+def win_probability(home_rating, away_rating):
+    """Chance the home team wins, with home court included."""
+    return 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - HOME_ADVANTAGE) / 400.0))
+
+
+def _rating_change(home_rating, away_rating, home_score, away_score):
+    """Rating points the home team gains (the away team loses the same).
+
+    Works on scalars and arrays. Wins by more move ratings further, damped when
+    the favourite wins so blowouts by strong teams don't inflate them.
+    """
+    margin = home_score - away_score
+    result = (margin > 0).astype(float) if isinstance(margin, np.ndarray) else float(margin > 0)
+    winner_edge = np.where(margin > 0, 1, -1) * (home_rating + HOME_ADVANTAGE - away_rating)
+    multiplier = np.log1p(np.abs(margin)) * 2.2 / (winner_edge * 0.001 + 2.2)
+    return K_FACTOR * multiplier * (result - win_probability(home_rating, away_rating))
+
+
+class EloRatings:
+    """Team ratings in flat NumPy arrays indexed by team code.
+
+    Codes are the game store's team vocabulary, so a rating is an array lookup
+    and applying one result is O(1).
+    """
+
+    def __init__(self, teams=()):
+        self.teams = list(teams)
+        self.codes = {team: code for code, team in enumerate(self.teams)}
+        self.ratings = np.full(len(self.teams), BASE_RATING)
+        self.games = np.zeros(len(self.teams), dtype=np.int32)
+        self.last_change = np.zeros(len(self.teams))
+        self.season = 0
+
+    def code(self, team):
+        """The team's code, adding teams the vocabulary hasn't seen."""
+        if team not in self.codes:
+            self.codes[team] = len(self.teams)
+            self.teams.append(team)
+            self._grow(len(self.teams))
+        return self.codes[team]
+
+    def _grow(self, size):
+        extra = size - len(self.ratings)
+        if extra > 0:
+            self.ratings = np.concatenate([self.ratings, np.full(extra, BASE_RATING)])
+            self.games = np.concatenate([self.games, np.zeros(extra, dtype=np.int32)])
+            self.last_change = np.concatenate([self.last_change, np.zeros(extra)])
+
+    def start_season(self, season):
+        """Regress every rating toward the mean when a new season begins."""
+        if season and season > self.season:
+            if self.season:
+                self.ratings = BASE_RATING + SEASON_CARRYOVER * (self.ratings - BASE_RATING)
+            self.season = season
+
+    def update(self, home, away, home_score, away_score, season=0):
+        """Apply one completed game. Teams are codes or names."""
+        home = self.code(home) if isinstance(home, str) else home
+        away = self.code(away) if isinstance(away, str) else away
+        self.start_season(season)
+
+        change = _rating_change(self.ratings[home], self.ratings[away], home_score, away_score)
+        self.ratings[home] += change
+        self.ratings[away] -= change
+        self.games[[home, away]] += 1
+        self.last_change[home], self.last_change[away] = change, -change
+        return float(change)
+
+    def replay(self, home_codes, away_codes, dates, seasons, home_scores, away_scores):
+        """Run a game history through the ratings and return pre-game ratings.
+
+        Games are processed a day at a time: a team plays at most once a day, so
+        every game of a day updates disjoint array slots and the whole day is a
+        single vectorized step. Games without scores (upcoming ones) get their
+        pre-game ratings but change nothing.
+
+        Returns (home_ratings, away_ratings) aligned with the input.
+        """
+        n = len(home_codes)
+        home_codes = np.asarray(home_codes, dtype=np.int64)
+        away_codes = np.asarray(away_codes, dtype=np.int64)
+        home_scores = np.asarray(home_scores, dtype=float)
+        away_scores = np.asarray(away_scores, dtype=float)
+        seasons = np.asarray(seasons, dtype=np.int64)
+        self._grow(int(max(home_codes.max(initial=-1), away_codes.max(initial=-1))) + 1)
+
+        days = np.asarray(dates).astype('datetime64[D]')
+        order = np.argsort(days, kind='stable')
+        new_day = np.ones(n, dtype=bool)
+        new_day[1:] = days[order][1:] != days[order][:-1]
+        bounds = np.append(np.flatnonzero(new_day), n)
+
+        pre_home = np.empty(n)
+        pre_away = np.empty(n)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            games = order[start:end]
+            self.start_season(seasons[games].max())
+            home, away = home_codes[games], away_codes[games]
+            pre_home[games] = self.ratings[home]
+            pre_away[games] = self.ratings[away]
+
+            played = ~(np.isnan(home_scores[games]) | np.isnan(away_scores[games]))
+            if not played.any():
+                continue
+            home, away, games = home[played], away[played], games[played]
+            change = _rating_change(pre_home[games], pre_away[games], home_scores[games], away_scores[games])
+            np.add.at(self.ratings, home, change)
+            np.add.at(self.ratings, away, -change)
+            np.add.at(self.games, home, 1)
+            np.add.at(self.games, away, 1)
+            self.last_change[home], self.last_change[away] = change, -change
+
+        return pre_home, pre_away
+
+    def table(self):
+        """(team, rating, games, last change) for every team that has played, best first."""
+        rows = [
+            (team, float(self.ratings[code]), int(self.games[code]), float(self.last_change[code]))
+            for code, team in enumerate(self.teams) if self.games[code]
+        ]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+# Live ratings for the bot, rebuilt from the game store and moved by the live scoreboard
+elo = EloRatings()
+
+# ESPN ids of games applied from the live scoreboard since the last rebuild
+_applied = set()
+
+# Last game day in the replayed store; live games up to it are already counted
+_through = None
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def add_ratings(df, history=None):
+    """Add RATING_FEATURES (pre-game Elo) to a game frame.
+
+    Same inputs as features.add_team_form(): `df` with HomeTeamCode,
+    AwayTeamCode and DateTime (plus scores for completed games), and the
+    completed `history` to replay first when predicting a slate.
+    """
+    games = df if history is None else pd.concat(
+        [history[pd.to_datetime(history['DateTime']) < pd.to_datetime(df['DateTime']).min()], df],
+        ignore_index=True,
+    )
+    seasons = games['Season'].fillna(0) if 'Season' in games.columns else np.zeros(len(games))
+
+    home, away = EloRatings().replay(
+        games['HomeTeamCode'].to_numpy(),
+        games['AwayTeamCode'].to_numpy(),
+        pd.to_datetime(games['DateTime']).to_numpy(),
+        seasons,
+        games['HomeTeamScore'].to_numpy(dtype=float, na_value=np.nan),
+        games['AwayTeamScore'].to_numpy(dtype=float, na_value=np.nan),
+    )
+    df['HomeElo'] = home[len(games) - len(df):]
+    df['AwayElo'] = away[len(games) - len(df):]
+    df['EloWinProb'] = win_probability(df['HomeElo'], df['AwayElo'])
+    return df
+
+
+def get_ratings():
+    """The live ratings. Look them up through here; a rebuild replaces the object."""
+    return elo
+
+
+def rebuild(frame, teams):
+    """Replace the live ratings with a replay of a game store frame."""
+    global elo, _through
+    ratings = EloRatings(teams)
+    ratings.replay(
+        frame['HomeTeam'].cat.codes.to_numpy(),
+        frame['AwayTeam'].cat.codes.to_numpy(),
+        frame['DateTime'].to_numpy(),
+        frame['Season'].to_numpy(),
+        frame['HomeTeamScore'].to_numpy(dtype=float),
+        frame['AwayTeamScore'].to_numpy(dtype=float),
+    )
+    elo = ratings
+    _through = frame['DateTime'].max().date() if len(frame) else None
+    _applied.clear()
+    return elo
+
+
+async def refresh_ratings(store):
+    """Rebuild the live ratings from the game store off the event loop."""
+    frame, teams = await asyncio.to_thread(lambda: (store.frame(), store.teams()))
+    return await asyncio.to_thread(rebuild, frame, teams)
+
+
+def _on_scores(key, games):
+    """Live score listener: apply NBA games as soon as ESPN marks them completed."""
+    if key != 'nba':
+        return
+    for game in games:
+        status = game.get('status', {}).get('type', {})
+        if not status.get('completed') or game.get('id') in _applied:
+            continue
+        start = start_time(game)
+        if start is None or (_through is not None and start.astimezone(GAME_DAY_TIMEZONE).date() <= _through):
+            continue
+        competitors = {c.get('homeAway'): c for c in game['competitions'][0]['competitors']}
+        if 'home' not in competitors or 'away' not in competitors:
+            continue
+
+        home, away = (
+            ESPN_ABBREVIATIONS.get(abbreviation, abbreviation)
+            for abbreviation in (competitors[side]['team']['abbreviation'] for side in ('home', 'away'))
+        )
+        elo.update(
+            home, away,
+            float(competitors['home'].get('score', 0)), float(competitors['away'].get('score', 0)),
+            season=game.get('season', {}).get('year', 0),
+        )
+        _applied.add(game.get('id'))
+
+
+async def start_ratings(store):
+    """Load the live ratings from the game store and keep them updated from the scoreboard."""
+    await refresh_ratings(store)
+    if _on_scores not in listeners:
+        listeners.append(_on_scores)
+    print(f"Elo ratings loaded for {len(elo.table())} teams.")
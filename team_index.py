@@ -0,0 +1,150 @@
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from cache import fetch_teams
+from leagues import LEAGUES
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+# --------------- Common nicknames ESPN doesn't list, mapped to ESPN abbreviations
+TEAM_ALIASES = {
+    'nba': {
+        'sixers': 'PHI', '76ers': 'PHI', 'cavs': 'CLE', 'mavs': 'DAL', 'wolves': 'MIN',
+        'twolves': 'MIN', 'blazers': 'POR', 'dubs': 'GS', 'warriors': 'GS', 'knicks': 'NY',
+        'nets': 'BKN', 'clips': 'LAC', 'lal': 'LAL', 'la lakers': 'LAL', 'la clippers': 'LAC',
+        'okc': 'OKC', 'nola': 'NO', 'pels': 'NO', 'spurs': 'SA', 'wiz': 'WSH', 'jazz': 'UTAH',
+        'philly': 'PHI', 'celts': 'BOS', 'dallas': 'DAL', 'nyk': 'NY', 'gsw': 'GS', 'sas': 'SA',
+        'nop': 'NO', 'uta': 'UTAH', 'was': 'WSH', 'pho': 'PHX', 'phx': 'PHX',
+    },
+    'nfl': {
+        'niners': 'SF', '9ers': 'SF', 'pats': 'NE', 'bolts': 'LAC', 'g men': 'NYG', 'gmen': 'NYG',
+        'fins': 'MIA', 'phins': 'MIA', 'pack': 'GB', 'bucs': 'TB', 'hawks': 'SEA', 'jags': 'JAX',
+        'commanders': 'WSH', 'commies': 'WSH', 'skins': 'WSH', 'birds': 'PHI', 'iggles': 'PHI',
+        'boys': 'DAL', 'cowboys': 'DAL', 'raiders': 'LV', 'chiefs': 'KC', 'bills': 'BUF',
+        'lar': 'LAR', 'la rams': 'LAR', 'la chargers': 'LAC', 'ny giants': 'NYG', 'ny jets': 'NYJ',
+        'gbp': 'GB', 'kcc': 'KC', 'nep': 'NE', 'sfo': 'SF', 'tbb': 'TB', 'was': 'WSH', 'jac': 'JAX',
+    },
+}
+
+# Fields of an ESPN team used as exact lookup keys
+KEY_FIELDS = ('abbreviation', 'displayName', 'shortDisplayName', 'name', 'nickname', 'location')
+
+FUZZY_MIN_SCORE = 0.5
+
+# Built indexes per league: key -> (teams payload the index was built from, TeamIndex)
+_indexes = {}
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def normalize(text):
+    """Lower-case and reduce to letters, digits and single spaces."""
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# -------------------------------------------------------------------------
+# ------------------------------ Team Index -------------------------------
+# -------------------------------------------------------------------------
+
+class TeamIndex:
+    """Exact, alias, prefix and fuzzy lookup over one league's teams."""
+
+    def __init__(self, teams, aliases=None):
+        self.teams = {}                 # team id -> ESPN team dict
+        self._exact = defaultdict(set)  # normalized key -> team ids
+        self._keys = []                 # (normalized key, team id) for fuzzy matching
+        self._trigram_index = defaultdict(set)  # trigram -> positions in _keys
+
+        by_abbreviation = {}
+        for entry in teams:
+            team = entry.get('team', entry)
+            self.teams[team['id']] = team
+            by_abbreviation[team.get('abbreviation', '').upper()] = team['id']
+            for field in KEY_FIELDS:
+                if team.get(field):
+                    self._add(normalize(team[field]), team['id'])
+
+        for alias, abbreviation in (aliases or {}).items():
+            if abbreviation in by_abbreviation:
+                self._add(normalize(alias), by_abbreviation[abbreviation])
+
+    def _add(self, key, team_id):
+        if team_id in self._exact[key]:
+            return
+        self._exact[key].add(team_id)
+        position = len(self._keys)
+        self._keys.append((key, team_id))
+        for gram in trigrams(key):
+            self._trigram_index[gram].add(position)
+
+    def search(self, query, limit=5):
+        """Return up to `limit` (team, score) pairs, best first. Exact hits score 1.0."""
+        query = normalize(query)
+        if not query:
+            return []
+
+        scores = {team_id: 1.0 for team_id in self._exact.get(query, ())}
+
+        # Prefix hits ("lak" -> Lakers) rank just below exact ones.
+        for key, team_id in self._keys:
+            if key.startswith(query):
+                scores[team_id] = max(scores.get(team_id, 0.0), 0.9)
+
+        # Keys sharing a trigram with the query are fuzzy candidates; an edit-distance
+        # style ratio on those catches typos ("lakres", "filadelfia").
+        candidates = set()
+        for gram in trigrams(query):
+            candidates.update(self._trigram_index.get(gram, ()))
+        for position in candidates:
+            key, team_id = self._keys[position]
+            score = SequenceMatcher(None, query, key).ratio() * 0.85
+            if score >= FUZZY_MIN_SCORE and score > scores.get(team_id, 0.0):
+                scores[team_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.teams[item[0]]['displayName']))
+        return [(self.teams[team_id], score) for team_id, score in ranked[:limit]]
+
+    def lookup(self, query):
+        """Return the single best team for a query, or None if nothing or several match equally."""
+        exact = self._exact.get(normalize(query), ())
+        if len(exact) == 1:
+            return self.teams[next(iter(exact))]  # Fast path for abbreviations, names and aliases
+
+        results = self.search(query, limit=2)
+        if not results:
+            return None
+        if len(results) > 1 and results[0][1] == results[1][1]:
+            return None  # Ambiguous, e.g. "New York" or "Los Angeles"
+        return results[0][0]
+
+
+async def get_team_index(key):
+    """Return the league's team index, rebuilding it only when the teams payload changes."""
+    teams = await fetch_teams(key)
+    built = _indexes.get(key)
+    if built is None or built[0] is not teams:
+        built = (teams, TeamIndex(teams, TEAM_ALIASES.get(key)))
+        _indexes[key] = built
+    return built[1]
+
+
+def cached_team_index(key):
+    """Return the last built index without touching the network, or None."""
+    built = _indexes.get(key)
+    return built[1] if built else None
+
+
+async def warm_team_indexes():
+    """Build every league's index up front so lookups and autocomplete never wait."""
+    for key in LEAGUES:
+        try:
+            await get_team_index(key)
+        except Exception as e:
+            print(f"Error building {key.upper()} team index: {e}")
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import threading
+import pytest
+from aiohttp import web
+
+# The bot's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+UPSTREAM_DELAY = 0.2  # Seconds each fake upstream response takes, so concurrent requests overlap
+
+
+@pytest.fixture
+def upstream():
+    """A local JSON server standing in for ESPN, run on its own thread and loop.
+
+    Yields its base URL. Every path answers {'path': ...} after UPSTREAM_DELAY,
+    and GET /hits returns {'hits': {path: requests served}}.
+    """
+    ready = threading.Event()
+    state = {}
+    hits = {}
+
+    async def handler(request):
+        hits[request.path] = hits.get(request.path, 0) + 1
+        await asyncio.sleep(UPSTREAM_DELAY)
+        return web.json_response({'path': request.path})
+
+    async def count(request):
+        return web.json_response({'hits': hits})
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get('/hits', count)
+        app.router.add_get('/{name}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        state['port'] = runner.addresses[0][1]
+        state['stop'] = asyncio.Event()
+        ready.set()
+        await state['stop'].wait()
+        await runner.cleanup()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    ready.wait()
+    yield f"http://127.0.0.1:{state['port']}"
+    loop.call_soon_threadsafe(state['stop'].set)
+    thread.join()
+    loop.close()
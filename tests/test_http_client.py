@@ -0,0 +1,58 @@
+import asyncio
+import http_client
+
+
+def test_concurrent_identical_fetches_share_one_upstream_call(monkeypatch):
+    calls = []
+
+    async def fake_get_json(url, params):
+        calls.append((url, params))
+        await asyncio.sleep(0.05)  # Stay in flight while every caller arrives
+        return {'events': []}, {'x-requests-remaining': '100'}
+
+    monkeypatch.setattr(http_client, '_get_json', fake_get_json)
+
+    async def main():
+        return await asyncio.gather(*(
+            http_client.fetch_json('https://example.invalid/scoreboard', {'dates': '20240101'})
+            for _ in range(500)
+        ))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert not http_client._in_flight
+
+
+def test_different_params_are_not_coalesced(monkeypatch):
+    calls = []
+
+    async def fake_get_json(url, params):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        return params, {}
+
+    monkeypatch.setattr(http_client, '_get_json', fake_get_json)
+
+    async def main():
+        return await asyncio.gather(*(
+            http_client.fetch_json('https://example.invalid/odds', {'page': i % 2}) for i in range(10)
+        ))
+
+    results = asyncio.run(main())
+    assert len(calls) == 2
+    assert [result['page'] for result in results] == [i % 2 for i in range(10)]
+
+
+def test_500_concurrent_commands_hit_a_real_server_once(upstream):
+    async def main():
+        try:
+            results = await asyncio.gather(*(http_client.fetch_json(f'{upstream}/scoreboard') for _ in range(500)))
+            hits = await http_client.fetch_json(f'{upstream}/hits')
+            return results, hits
+        finally:
+            await http_client.close_session()
+
+    results, hits = asyncio.run(main())
+    assert all(result is results[0] for result in results)
+    assert hits['hits']['/scoreboard'] == 1
@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+TRACK_CACHE_FILE = os.path.join('data', 'track_cache.json')  # None disables persistence
+
+QUERY_TTL = 7 * 24 * 60 * 60   # Seconds a search keeps pointing at the same video
+STREAM_MIN_LIFETIME = 30 * 60  # Stream URLs closer than this to expiring are looked up again
+MAX_QUERIES = 4096
+MAX_STREAMS = 1024
+SAVE_EVERY = 25                # Stores between writes to disk
+
+# -------------------------------------------------------------------------
+# ------------------------------ Track Cache ------------------------------
+# -------------------------------------------------------------------------
+
+def normalize_query(query):
+    """Cache key for a search: case and spacing don't matter. URLs are kept as they are."""
+    query = query.strip()
+    if query.startswith(('http://', 'https://')):
+        return query
+    return ' '.join(query.lower().split())
+
+
+class TrackCache:
+    """Two-level LRU cache for yt_dlp lookups.
+
+    Searches map to a video for QUERY_TTL, and videos map to their resolved
+    track (stream URL and format metadata) until the stream URL's own expiry.
+    A search whose video is known but whose stream has expired can then be
+    looked up by the video's URL, which skips the search. Times are wall-clock
+    so the cache can be saved and loaded across restarts.
+    """
+
+    def __init__(self, path=TRACK_CACHE_FILE, max_queries=MAX_QUERIES, max_streams=MAX_STREAMS):
+        self.path = path
+        self.max_queries = max_queries
+        self.max_streams = max_streams
+        self._queries = OrderedDict()  # normalized query -> (video id, video URL, stored at)
+        self._streams = OrderedDict()  # video id -> track
+        self._latency = {'search': [0, 0.0], 'video': [0, 0.0]}  # kind -> [lookups, total seconds]
+        self._unsaved = 0
+        self._loaded = False
+        self.hits = 0            # Track served straight from the cache
+        self.partial_hits = 0    # Video known, stream looked up again
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def lookup(self, query):
+        """(track, None) on a full hit, (None, video URL) when only the video is known, else (None, None).
+
+        Tracks are returned as copies, because players update the ones they queue.
+        """
+        self._load()
+        now = time.time()
+        key = normalize_query(query)
+
+        entry = self._queries.get(key)
+        if entry is None or now - entry[2] > QUERY_TTL:
+            self._queries.pop(key, None)
+            self.misses += 1
+            return None, None
+        self._queries.move_to_end(key)
+        video_id, video_url, _ = entry
+
+        track = self._streams.get(video_id)
+        if track is not None and track['expires'] - now > STREAM_MIN_LIFETIME:
+            self._streams.move_to_end(video_id)
+            self.hits += 1
+            self.saved_seconds += self._mean_latency('search')
+            return dict(track), None
+
+        self._streams.pop(video_id, None)
+        self.partial_hits += 1
+        return None, video_url
+
+    def store(self, query, track, seconds, kind='search'):
+        """Remember a lookup that took `seconds`; `kind` is 'search' or 'video' (a partial hit)."""
+        counts = self._latency[kind]
+        counts[0] += 1
+        counts[1] += seconds
+        if kind == 'video':
+            self.saved_seconds += max(0.0, self._mean_latency('search') - seconds)
+
+        video_id = track.get('id')
+        if not video_id:
+            return
+        self._queries[normalize_query(query)] = (video_id, track.get('webpage_url') or query, time.time())
+        self._queries.move_to_end(normalize_query(query))
+        self._streams[video_id] = dict(track)
+        self._streams.move_to_end(video_id)
+        _evict(self._queries, self.max_queries)
+        _evict(self._streams, self.max_streams)
+
+        self._unsaved += 1
+        if self._unsaved >= SAVE_EVERY:
+            self.save()
+
+    def _mean_latency(self, kind):
+        count, total = self._latency[kind]
+        return total / count if count else 0.0
+
+    # --------------- Persistence
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load the track cache: {e}")
+            return
+        self._queries.update((key, tuple(entry)) for key, entry in saved.get('queries', []))
+        self._streams.update(saved.get('streams', []))
+        for kind, counts in saved.get('latency', {}).items():
+            self._latency[kind] = counts
+
+    def save(self):
+        """Write the cache to disk, dropping expired entries."""
+        self._unsaved = 0
+        if not self.path:
+            return
+        now = time.time()
+        saved = {
+            'queries': [[key, entry] for key, entry in self._queries.items() if now - entry[2] <= QUERY_TTL],
+            'streams': [[video_id, track] for video_id, track in self._streams.items() if track['expires'] > now],
+            'latency': self._latency,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(saved, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not save the track cache: {e}")
+
+    def stats(self):
+        """Hit rates and the lookup time saved, for monitoring."""
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            'queries': len(self._queries),
+            'streams': len(self._streams),
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'video_hit_rate': (self.hits + self.partial_hits) / lookups if lookups else 0.0,
+            'mean_search_seconds': self._mean_latency('search'),
+            'saved_seconds': self.saved_seconds,
+        }
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def _evict(entries, max_entries):
+    while len(entries) > max_entries:
+        entries.popitem(last=False)  # Evict the least recently used entry
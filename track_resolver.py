@@ -0,0 +1,268 @@
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+import yt_dlp
+from track_cache import TrackCache
+
+# --------------------------------------------------------------------------
+# ------------------------------ Declarations ------------------------------
+# --------------------------------------------------------------------------
+
+YDL_OPTIONS = {'format': 'bestaudio/best', 'noplaylist': 'True', 'default_search': 'ytsearch'}
+# Playlists are only listed (IDs and titles, a page request per ~100 entries);
+# each entry's stream is looked up just before it plays
+MAX_PLAYLIST_TRACKS = 500
+PLAYLIST_OPTIONS = {'extract_flat': 'in_playlist', 'playlistend': MAX_PLAYLIST_TRACKS, 'quiet': True, 'skip_download': True}
+PLAYLIST_PATHS = ('/playlist', '/sets/', '/album/')  # YouTube, SoundCloud and Bandcamp
+
+RESOLVE_WORKERS = 4        # yt_dlp lookups running at once across all guilds
+PER_GUILD_RESOLVES = 2     # ...and within one guild, so one busy server can't take every worker
+MAX_WAITING_RESOLVES = 50  # Lookups queued before new ones are turned away
+RESOLVE_TIMEOUT = 20       # Seconds
+DEFAULT_STREAM_LIFETIME = 5 * 60 * 60  # Seconds; YouTube stream URLs usually last about six hours
+
+
+class ResolverBusy(Exception):
+    """Raised when too many lookups are already waiting."""
+
+
+class ResolveCancelled(Exception):
+    """Raised when a lookup is cancelled because its requester left the voice channel."""
+
+# -----------------------------------------------------------------------
+# ------------------------------ Functions ------------------------------
+# -----------------------------------------------------------------------
+
+def stream_expiry(url, resolved_at):
+    """When a stream URL stops working: its 'expire' parameter, or a conservative guess."""
+    try:
+        return float(parse_qs(urlparse(url).query)['expire'][0])
+    except (KeyError, IndexError, ValueError):
+        return resolved_at + DEFAULT_STREAM_LIFETIME
+
+
+def extract_track(query):
+    """Look a search or URL up with yt_dlp. Blocking; runs in the resolver's threads.
+
+    Returns the stream 'url', 'title', 'webpage_url', video 'id', 'expires'
+    and format metadata. The stream URL stops working at `expires` (epoch
+    seconds); the track can be looked up again by its webpage_url.
+    """
+    target = query if query.startswith(('http://', 'https://')) else f"ytsearch:{query}"
+    with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl:
+        info = ydl.extract_info(target, download=False)
+    if 'entries' in info:
+        info = info['entries'][0]
+    return {
+        'url': info['url'],
+        'title': info['title'],
+        'webpage_url': info.get('webpage_url') or query,
+        'id': info.get('id'),
+        'expires': stream_expiry(info['url'], time.time()),
+        'duration': info.get('duration'),
+        'is_live': bool(info.get('is_live')),
+        'ext': info.get('ext'),
+        'acodec': info.get('acodec'),
+        'abr': info.get('abr'),
+    }
+
+def is_playlist_url(query):
+    """Whether a /play query is a playlist or album link rather than a single track or a search.
+
+    A link to one video that was opened from a playlist or mix (watch?v=...&list=...)
+    plays just that video, as noplaylist does for single lookups.
+    """
+    if not query.startswith(('http://', 'https://')):
+        return False
+    url = urlparse(query)
+    if 'v' in parse_qs(url.query):
+        return False
+    return any(part in url.path for part in PLAYLIST_PATHS)
+
+
+def extract_playlist(url):
+    """List a playlist's entries with yt_dlp without looking any of them up. Blocking.
+
+    Returns {'title': playlist title, 'tracks': [...]}, where each track has
+    only a 'title', 'webpage_url' and video 'id' and no stream 'url' yet. Unavailable
+    entries, which have no URL, are skipped. Returns None if the link
+    turns out to be a single track.
+    """
+    with yt_dlp.YoutubeDL(PLAYLIST_OPTIONS) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if 'entries' not in info:
+        return None
+    tracks = []
+    for entry in info['entries']:
+        page = entry and (entry.get('webpage_url') or entry.get('url'))
+        if page:
+            tracks.append({'title': entry.get('title') or page, 'webpage_url': page, 'id': entry.get('id')})
+    return {'title': info.get('title') or url, 'tracks': tracks}
+
+# -------------------------------------------------------------------------
+# ------------------------------ Track Resolver ---------------------------
+# -------------------------------------------------------------------------
+
+class TrackResolver:
+    """Runs yt_dlp lookups in a thread pool, off the event loop.
+
+    Lookups wait on a global and a per-guild semaphore before they reach the
+    pool, so waiting is cheap and cancellable. Each lookup is registered under
+    its (guild, user), and cancel() drops the user's lookups when they leave
+    voice. A lookup that has reached a thread can't be interrupted, but its
+    result is discarded.
+    """
+
+    def __init__(self, extract=extract_track, extract_list=extract_playlist, workers=RESOLVE_WORKERS, per_guild=PER_GUILD_RESOLVES,
+                 max_waiting=MAX_WAITING_RESOLVES, timeout=RESOLVE_TIMEOUT, cache=None):
+        self.extract = extract
+        self.extract_list = extract_list
+        self.cache = cache
+        self.workers = workers
+        self.per_guild = per_guild
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._pool = None
+        self._slots = None          # Global semaphore, created on the running loop
+        self._guild_slots = {}      # guild id -> semaphore
+        self._pending = {}          # (guild id, user id) -> set of lookup tasks
+        self._cancelled = set()     # Tasks cancelled through cancel()
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='yt-dlp')
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._pool
+
+    async def _run(self, extract, query, guild_id):
+        pool = self._executor()
+        guild_slots = self._guild_slots.setdefault(guild_id, asyncio.Semaphore(self.per_guild))
+        async with guild_slots, self._slots:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(pool, extract, query), self.timeout)
+
+    async def _submit(self, extract, query, guild_id, user_id):
+        """Run a lookup in the pool, registered under (guild, user) so cancel() can drop it."""
+        if self.pending() >= self.max_waiting:
+            raise ResolverBusy(f"{self.pending()} track lookups are already queued.")
+
+        key = (guild_id, user_id)
+        task = asyncio.ensure_future(self._run(extract, query, guild_id))
+        self._pending.setdefault(key, set()).add(task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task in self._cancelled:
+                raise ResolveCancelled(f"Lookup for '{query}' was cancelled.") from None
+            task.cancel()  # The caller itself was cancelled
+            raise
+        finally:
+            self._cancelled.discard(task)
+            tasks = self._pending.get(key)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self._pending[key]
+
+    async def resolve(self, query, guild_id, user_id=None, use_cache=True):
+        """Resolve a search or URL to a track dict (see extract_track).
+
+        Cached tracks are returned without touching the pool; when only the
+        search's video is cached, the video is looked up by URL, skipping the
+        search. Raises ResolverBusy when the queue is full, asyncio.TimeoutError
+        after `timeout` seconds in a worker and ResolveCancelled if cancel() is
+        called for this guild and user first.
+        """
+        target, kind = query, 'search'
+        if self.cache is not None and use_cache:
+            track, video_url = self.cache.lookup(query)
+            if track is not None:
+                return track
+            if video_url is not None:
+                target, kind = video_url, 'video'
+
+        started = time.perf_counter()
+        track = await self._submit(self.extract, target, guild_id, user_id)
+        if self.cache is not None:
+            self.cache.store(query, track, time.perf_counter() - started, kind)
+        return track
+
+    async def resolve_playlist(self, url, guild_id, user_id=None):
+        """List a playlist's entries (see extract_playlist) through the same queue as lookups."""
+        return await self._submit(self.extract_list, url, guild_id, user_id)
+
+    def cancel(self, guild_id, user_id=None):
+        """Cancel a user's lookups in a guild (every user's if user_id is None). Returns how many."""
+        keys = [key for key in self._pending if key[0] == guild_id and (user_id is None or key[1] == user_id)]
+        cancelled = 0
+        for key in keys:
+            for task in self._pending[key]:
+                if not task.done():
+                    self._cancelled.add(task)
+                    task.cancel()
+                    cancelled += 1
+        return cancelled
+
+    def pending(self):
+        return sum(len(tasks) for tasks in self._pending.values())
+
+    def shutdown(self):
+        if self.cache is not None:
+            self.cache.save()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self):
+        stats = {'workers': self.workers, 'per_guild': self.per_guild, 'pending': self.pending()}
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+
+# Shared resolver for the whole bot, with a cache that persists across restarts
+resolver = TrackResolver(cache=TrackCache())
+
+# -------------------------------------------------------------------------
+# ------------------------------ Load Check -------------------------------
+# -------------------------------------------------------------------------
+
+async def _load_check(plays=20, lookup_seconds=2.0):
+    """Fire `plays` lookups at once and measure how late the event loop runs meanwhile.
+
+    The lookups block their threads with time.sleep, like a slow yt_dlp call,
+    while a ticker stands in for every other command.
+    """
+    def slow_extract(query):
+        time.sleep(lookup_seconds)
+        return {'url': f'https://example.invalid/{query}', 'title': query, 'webpage_url': query, 'expires': time.time() + 3600}
+
+    test_resolver = TrackResolver(extract=slow_extract, timeout=plays * lookup_seconds)
+    lags = []
+
+    async def ticker():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.05)
+            lags.append(time.perf_counter() - started - 0.05)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        test_resolver.resolve(f'song {i}', guild_id=i % 5, user_id=i) for i in range(plays)
+    ))
+    elapsed = time.perf_counter() - started
+    tick.cancel()
+    test_resolver.shutdown()
+
+    print(f"{len(results)} lookups of {lookup_seconds}s each finished in {elapsed:.1f}s "
+          f"with {test_resolver.workers} workers.")
+    print(f"Event loop lag while they ran: max {max(lags) * 1000:.1f} ms, "
+          f"mean {sum(lags) / len(lags) * 1000:.1f} ms over {len(lags)} ticks.")
+
+
+if __name__ == '__main__':
+    # Usage: python track_resolver.py [simultaneous plays]
+    asyncio.run(_load_check(int(sys.argv[1]) if len(sys.argv) > 1 else 20))